@@ -1,17 +1,21 @@
 #!/usr/bin/env python3
 """
 Quick FTP Send - Upload files/folders to FTP server instantly
-Usage: ftpsend file1 folder1 file2 ...
+Usage: ftpsend [--pipeline] [--jobs N] [--async] file1 folder1 file2 ...
+       ftpsend --daemon [--pipeline] [--jobs N] [--async]
 """
 
 import sys
 import ftplib
 import os
+import socket
 import time
 import signal
 import threading
 import json
-import readline
+import queue
+import contextlib
+from functools import lru_cache
 from pathlib import Path
 
 # Global cancel flag
@@ -26,6 +30,12 @@ DEFAULT_PORT = 9999
 USER = "anonymous"
 PASS = ""
 
+# Transfer block size (override with FTPSEND_BLOCKSIZE env var)
+try:
+    BLOCKSIZE = int(os.environ.get('FTPSEND_BLOCKSIZE', 65536))
+except ValueError:
+    BLOCKSIZE = 65536
+
 # Load last successful connection or use defaults
 def load_config():
     if CONFIG_FILE.exists():
@@ -45,31 +55,197 @@ def save_config(host, port):
     except:
         pass
 
-# Load saved config
-HOST, PORT = load_config()
+# Server address, loaded from the saved config once a command needs it
+HOST = None
+PORT = None
+
+# Styled output only on a terminal; plain text when piped or redirected
+_TTY = sys.stdout.isatty()
 
 # ANSI colors and styles
-GREEN = '\033[92m'
-RED = '\033[91m'
-YELLOW = '\033[93m'
-CYAN = '\033[96m'
-BLUE = '\033[94m'
-MAGENTA = '\033[95m'
-WHITE = '\033[97m'
-BOLD = '\033[1m'
-DIM = '\033[2m'
-RESET = '\033[0m'
+GREEN = '\033[92m' if _TTY else ''
+RED = '\033[91m' if _TTY else ''
+YELLOW = '\033[93m' if _TTY else ''
+CYAN = '\033[96m' if _TTY else ''
+BLUE = '\033[94m' if _TTY else ''
+MAGENTA = '\033[95m' if _TTY else ''
+WHITE = '\033[97m' if _TTY else ''
+BOLD = '\033[1m' if _TTY else ''
+DIM = '\033[2m' if _TTY else ''
+RESET = '\033[0m' if _TTY else ''
 
 # Box drawing characters
-BOX_H = '─'
-BOX_V = '│'
-BOX_TL = '╭'
-BOX_TR = '╮'
-BOX_BL = '╰'
-BOX_BR = '╯'
+BOX_H = '─' if _TTY else '-'
+BOX_V = '│' if _TTY else '|'
+BOX_TL = '╭' if _TTY else '+'
+BOX_TR = '╮' if _TTY else '+'
+BOX_BL = '╰' if _TTY else '+'
+BOX_BR = '╯' if _TTY else '+'
+
+# Progress bar pieces, built once; bars are sliced out of these
+PROGRESS_WIDTH = 30
+BAR_FULL = ('█' if _TTY else '#') * PROGRESS_WIDTH
+BAR_EMPTY = ('░' if _TTY else '.') * PROGRESS_WIDTH
+PROGRESS_FMT = (f'\r    {{prefix}}{WHITE}{{name:<{{max_name}}}}{RESET} {CYAN}[{{bar}}]{RESET} '
+                f'{GREEN}{{percent:>5.1%}}{RESET} {DIM}{{size_info}} @ {{speed}}{RESET}')
+
+# Read buffer for files being uploaded
+READ_BUFFER = 1 << 20
+
+# Concurrent sessions for --async uploads unless --jobs is given
+ASYNC_WORKERS = 8
+
+# Unix socket of the persistent-connection daemon (ftpsend --daemon)
+SOCKET_PATH = Path.home() / ".ftpsend.sock"
+
+# Seconds of inactivity before the daemon sends a keepalive NOOP
+KEEPALIVE_INTERVAL = 25
+
+# Minimum seconds between progress bar redraws (20 Hz)
+PROGRESS_INTERVAL = 0.05
+
+# Socket send buffer for control/data connections
+SOCKET_SNDBUF = 1 << 20
+
+def tune_socket(sock):
+    """Disable Nagle and enlarge the send buffer on a connected socket"""
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_SNDBUF)
+    except OSError:
+        pass
+
+def open_for_upload(local_path):
+    """Open a file for one sequential read with a large buffer
+
+    Also hints the kernel to read ahead aggressively where posix_fadvise
+    exists (length 0 means "to end of file").
+    """
+    f = open(local_path, 'rb', buffering=READ_BUFFER)
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    return f
+
+def open_ftp(ftp_class, host, port):
+    """Connect and log in a new ftp_class session"""
+    ftp = ftp_class()
+    ftp.connect(host, port, timeout=10)
+    ftp.login(USER, PASS)
+    return ftp
+
+def send_file_data(conn, fp, callback=None):
+    """Copy fp to the data connection in BLOCKSIZE pieces
+
+    socket.sendfile() lets the kernel move the bytes (os.sendfile) and falls
+    back to read/send where that is unavailable, e.g. on TLS sockets.
+    Stops early, without raising, once the transfer is cancelled.
+    """
+    offset = 0
+    while not cancelled:
+        sent = conn.sendfile(fp, offset, BLOCKSIZE)
+        if not sent:
+            break
+        offset += sent
+        if callback:
+            callback(sent)
+
+class TunedFTP(ftplib.FTP):
+    """FTP client with TCP_NODELAY and a large SO_SNDBUF on every socket"""
+
+    def __init__(self, *args, **kwargs):
+        # Remote directories known to exist (see ensure_remote_dir)
+        self.known_dirs = set()
+        super().__init__(*args, **kwargs)
+
+    def connect(self, *args, **kwargs):
+        welcome = super().connect(*args, **kwargs)
+        tune_socket(self.sock)
+        return welcome
+
+    def ntransfercmd(self, cmd, rest=None):
+        conn, size = super().ntransfercmd(cmd, rest)
+        tune_socket(conn)
+        return conn, size
+
+    def storfile(self, cmd, fp, callback=None):
+        """Upload fp with cmd (e.g. STOR) using zero-copy sendfile
+
+        callback receives the byte count of every chunk sent.
+        """
+        self.voidcmd('TYPE I')
+        with self.transfercmd(cmd) as conn:
+            send_file_data(conn, fp, callback)
+        return self.voidresp()
+
+class PipelinedFTP(TunedFTP):
+    """TunedFTP for batches of small uploads
+
+    Sends TYPE I once per session instead of before every file. The reply
+    to each STOR is counted as pending and drained at the file boundary,
+    before the next file's MKD or PASV, so a failure is raised for the file
+    that caused it and never inside a later command.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.pending = 0
+        self.binary = False
+        super().__init__(*args, **kwargs)
+
+    def getresp(self):
+        try:
+            self.drain()
+        except ftplib.Error:
+            # Consume the reply to the command just sent before reporting
+            try:
+                super().getresp()
+            except ftplib.Error:
+                pass
+            raise
+        return super().getresp()
+
+    def drain(self):
+        """Read all deferred upload replies, raising the first failure"""
+        error = None
+        while self.pending:
+            self.pending -= 1
+            try:
+                resp = super().getresp()
+                if resp[:1] != '2':
+                    raise ftplib.error_reply(resp)
+            except ftplib.Error as e:
+                error = error or e
+        if error:
+            raise error
+
+    def storfile(self, cmd, fp, callback=None):
+        if not self.binary:
+            self.voidcmd('TYPE I')
+            self.binary = True
+        with self.transfercmd(cmd) as conn:
+            try:
+                send_file_data(conn, fp, callback)
+                # Wait for the server to close its end: some servers abort a
+                # transfer whose data channel is still open when PASV arrives
+                conn.shutdown(socket.SHUT_WR)
+                conn.recv(1)
+            except BaseException:
+                # The server replies even to an aborted transfer; read it so
+                # the next file does not inherit it, but report the original
+                self.pending += 1
+                try:
+                    self.drain()
+                except ftplib.all_errors:
+                    pass
+                raise
+        self.pending += 1
+        self.drain()
 
 def clear_screen():
-    print('\033[2J\033[H', end='')
+    if _TTY:
+        print('\033[2J\033[H', end='')
 
 def handle_cancel(signum, frame):
     """Handle Ctrl+C to cancel transfer"""
@@ -77,20 +253,18 @@ def handle_cancel(signum, frame):
     cancelled = True
     print(f"\n\n  {YELLOW}⚠ Cancelling transfer...{RESET}")
 
-signal.signal(signal.SIGINT, handle_cancel)
-
+@lru_cache(maxsize=None)
 def get_terminal_width():
     try:
         return os.get_terminal_size().columns
     except:
         return 60
 
+_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
 def format_size(size):
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size < 1024:
-            return f"{size:.1f} {unit}"
-        size /= 1024
-    return f"{size:.1f} TB"
+    shift = min(max((int(size).bit_length() - 1) // 10, 0), len(_UNITS) - 1)
+    return f"{size / (1 << (shift * 10)):.1f} {_UNITS[shift]}"
 
 def draw_header():
     width = min(get_terminal_width() - 2, 60)
@@ -101,18 +275,21 @@ def draw_header():
     padding = (width - len(title) - 4) // 2
     print(f"  {CYAN}{BOX_V}{RESET}{' ' * padding}{WHITE}{BOLD}{title}{RESET}{' ' * (width - len(title) - padding - 4)}{CYAN}{BOX_V}{RESET}")
 
-    server_info = f"Server: {HOST}:{PORT}"
-    padding = (width - len(server_info) - 2) // 2
-    print(f"  {CYAN}{BOX_V}{RESET}{' ' * padding}{DIM}{server_info}{RESET}{' ' * (width - len(server_info) - padding - 2)}{CYAN}{BOX_V}{RESET}")
+    if HOST is not None:
+        server_info = f"Server: {HOST}:{PORT}"
+        padding = (width - len(server_info) - 2) // 2
+        print(f"  {CYAN}{BOX_V}{RESET}{' ' * padding}{DIM}{server_info}{RESET}{' ' * (width - len(server_info) - padding - 2)}{CYAN}{BOX_V}{RESET}")
 
     print(f"  {CYAN}{BOX_BL}{BOX_H * (width - 2)}{BOX_BR}{RESET}\n")
 
 def draw_section(title, color=CYAN):
     width = min(get_terminal_width() - 4, 58)
-    print(f"  {color}{BOLD}{'─' * 3} {title} {'─' * (width - len(title) - 5)}{RESET}")
+    print(f"  {color}{BOLD}{BOX_H * 3} {title} {BOX_H * (width - len(title) - 5)}{RESET}")
 
 def get_input(prompt, default=""):
     """Get user input with optional default value prefilled"""
+    import readline
+
     def prefill_hook():
         readline.insert_text(default)
         readline.redisplay()
@@ -155,10 +332,10 @@ def change_server():
 
     print(f"\n  {GREEN}✓{RESET} Server set to {HOST}:{PORT}")
 
-def progress_bar(current, total, filename, start_time, queue_info="", width=30):
+def progress_bar(current, total, filename, start_time, queue_info="", width=PROGRESS_WIDTH, total_str=None):
     percent = current / total if total > 0 else 1
     filled = int(width * percent)
-    bar = '█' * filled + '░' * (width - filled)
+    bar = BAR_FULL[:filled] + BAR_EMPTY[filled:width]
 
     # Calculate speed
     elapsed = time.time() - start_time
@@ -166,7 +343,7 @@ def progress_bar(current, total, filename, start_time, queue_info="", width=30):
     speed_str = f"{format_size(speed)}/s"
 
     # Size info
-    size_info = f"{format_size(current)}/{format_size(total)}"
+    size_info = f"{format_size(current)}/{total_str or format_size(total)}"
 
     # Truncate filename if too long
     max_name = 18 if queue_info else 20
@@ -175,100 +352,276 @@ def progress_bar(current, total, filename, start_time, queue_info="", width=30):
     # Add queue info if provided
     prefix = f"{CYAN}{queue_info}{RESET} " if queue_info else ""
 
-    sys.stdout.write(f'\r    {prefix}{WHITE}{display_name:<{max_name}}{RESET} {CYAN}[{bar}]{RESET} {GREEN}{percent:>5.1%}{RESET} {DIM}{size_info} @ {speed_str}{RESET}')
+    sys.stdout.write(PROGRESS_FMT.format(prefix=prefix, name=display_name, max_name=max_name, bar=bar,
+                                         percent=percent, size_info=size_info, speed=speed_str))
     sys.stdout.flush()
 
 def ensure_remote_dir(ftp, remote_path):
-    """Create remote directory structure if it doesn't exist"""
+    """Create remote directory structure if it doesn't exist
+
+    Each level is created with a single optimistic MKD (a 550 reply means it
+    already exists) and remembered in ftp.known_dirs, so a directory costs
+    at most one round trip per session.
+    """
     dirs = remote_path.split('/')
     current = ""
     for d in dirs:
         if not d:
             continue
         current += "/" + d
+        if current in ftp.known_dirs:
+            continue
         try:
-            ftp.cwd(current)
+            ftp.mkd(current)
         except ftplib.error_perm:
-            try:
-                ftp.mkd(current)
-            except ftplib.error_perm:
-                pass
-
-def upload_file(ftp, local_path, remote_dir="", queue_info=""):
-    """Upload a single file with progress bar"""
-    global cancelled
-    if cancelled:
-        raise Exception("Cancelled")
-
-    file_size = local_path.stat().st_size
-    uploaded = [0]
-    start_time = time.time()
-
-    def callback(data):
-        if cancelled:
-            raise Exception("Cancelled")
-        uploaded[0] += len(data)
-        progress_bar(uploaded[0], file_size, local_path.name, start_time, queue_info)
+            pass
+        ftp.known_dirs.add(current)
 
+def store_file(ftp, local_path, remote_dir, callback):
+    """Send one file into remote_dir, calling callback with each chunk's size"""
+    # Absolute STOR paths leave the working directory alone, so no CWD
+    # round trips are needed before or after the upload
     if remote_dir:
         ensure_remote_dir(ftp, remote_dir)
-        ftp.cwd('/' + remote_dir)
-
-    with open(local_path, 'rb') as f:
-        ftp.storbinary(f'STOR {local_path.name}', f, blocksize=8192, callback=callback)
+        target = f"/{remote_dir}/{local_path.name}"
+    else:
+        target = local_path.name
 
-    ftp.cwd('/')
+    with open_for_upload(local_path) as f:
+        ftp.storfile(f'STOR {target}', f, callback=callback)
 
-    elapsed = time.time() - start_time
-    print(f" {GREEN}✓{RESET} {DIM}({elapsed:.1f}s){RESET}")
+    # The data loop stops quietly on Ctrl+C; report it once per file
+    if cancelled:
+        raise Exception("Cancelled")
 
-def upload_folder(ftp, folder_path, base_remote="", queue_info=""):
-    """Recursively upload a folder"""
+def upload_file(ftp, local_path, remote_dir="", queue_info="", file_size=None):
+    """Upload a single file with progress bar"""
     global cancelled
     if cancelled:
-        return 0, 0
-
-    folder_name = folder_path.name
-    remote_base = f"{base_remote}/{folder_name}" if base_remote else folder_name
-
-    print(f"\n    {BLUE}📁 {BOLD}{folder_name}/{RESET}")
+        raise Exception("Cancelled")
 
-    files_uploaded = 0
-    errors = 0
+    if file_size is None:
+        file_size = local_path.stat().st_size
+    total_str = format_size(file_size)
+    uploaded = 0
+    last_draw = 0.0
+    start_time = time.time()
 
-    items = sorted(folder_path.iterdir(), key=lambda x: (x.is_file(), x.name.lower()))
+    def callback(sent):
+        nonlocal uploaded, last_draw
+        uploaded += sent
+        # Redraw at most every PROGRESS_INTERVAL, but always show the final state
+        now = time.monotonic()
+        if now - last_draw > PROGRESS_INTERVAL or uploaded == file_size:
+            last_draw = now
+            progress_bar(uploaded, file_size, local_path.name, start_time, queue_info, total_str=total_str)
 
-    for item in items:
-        if cancelled:
-            break
-        if item.is_file():
-            try:
-                upload_file(ftp, item, remote_base, queue_info)
-                files_uploaded += 1
-            except Exception as e:
-                if "Cancelled" not in str(e):
-                    print(f" {RED}✗ {e}{RESET}")
-                    errors += 1
-                break
-        elif item.is_dir():
-            sub_uploaded, sub_errors = upload_folder(ftp, item, remote_base, queue_info)
-            files_uploaded += sub_uploaded
-            errors += sub_errors
+    store_file(ftp, local_path, remote_dir, callback)
 
-    return files_uploaded, errors
+    elapsed = time.time() - start_time
+    print(f" {GREEN}✓{RESET} {DIM}({elapsed:.1f}s){RESET}")
 
-def collect_stats(path):
-    """Count files and total size in a path"""
+def walk_files(folder, remote_dir):
+    """Yield (local_path, remote_dir, size) for every file under folder
+
+    Uses os.scandir so each entry's type and size come from the cached
+    DirEntry instead of separate stat() calls. Subfolders come before the
+    folder's own files, each in name order, as upload_folder sent them.
+    """
+    # is_file() answers from the directory read, except for symlinks, whose
+    # stat() DirEntry caches for the dispatch below: the key costs nothing
+    with os.scandir(folder) as it:
+        entries = sorted(it, key=lambda x: (x.is_file(), x.name.lower()))
+    for entry in entries:
+        if entry.is_file():
+            yield Path(entry.path), remote_dir, entry.stat().st_size
+        elif entry.is_dir():
+            yield from walk_files(entry.path, f"{remote_dir}/{entry.name}")
+
+def plan_path(path):
+    """List the (local_path, remote_dir, size) uploads for one file or folder"""
     if path.is_file():
-        return 1, path.stat().st_size
+        return [(path, "", path.stat().st_size)]
+    return list(walk_files(path, path.name))
+
+def build_work_list(paths):
+    """Flatten files and folders into one upload plan"""
+    plan = []
+    for path in paths:
+        plan.extend(plan_path(path))
+    return plan
+
+class BatchProgress:
+    """Thread-safe combined progress bar for concurrent uploads"""
+
+    def __init__(self, jobs):
+        self.total_files = len(jobs)
+        self.total_size = sum(size for _, _, size in jobs)
+        self.total_str = format_size(self.total_size)
+        self.sent = 0
+        self.done = 0
+        self.success = 0
+        self.errors = 0
+        self.last_draw = 0.0
+        self.start_time = time.time()
+        self.lock = threading.Lock()
+
+    def draw(self, force=False):
+        now = time.monotonic()
+        if force or now - self.last_draw > PROGRESS_INTERVAL:
+            self.last_draw = now
+            progress_bar(self.sent, self.total_size, f"{self.done}/{self.total_files} files",
+                         self.start_time, total_str=self.total_str)
+
+    def add(self, sent):
+        """Progress callback: count bytes sent by any worker"""
+        with self.lock:
+            self.sent += sent
+            self.draw()
+
+    def finish(self, name, error=None):
+        """Record one finished file, printing a line if it failed"""
+        with self.lock:
+            self.done += 1
+            if error is None:
+                self.success += 1
+            elif "Cancelled" not in str(error):
+                self.errors += 1
+                sys.stdout.write(f"\r    {RED}✗ {name}: {error}{RESET}\n")
+            self.draw(force=True)
+
+    def close(self):
+        elapsed = time.time() - self.start_time
+        print(f" {GREEN}✓{RESET} {DIM}({elapsed:.1f}s){RESET}")
+        return self.success, self.errors
+
+def upload_parallel(ftp, jobs, workers):
+    """Upload a plan over up to `workers` connections, one job per file
+
+    ftp is reused as the first connection; every other worker opens its own
+    and closes it when the work runs out. A worker whose session the server
+    refuses (e.g. 421, too many connections) just exits and leaves the files
+    to the connections that work. Returns (success, errors).
+    """
+    progress = BatchProgress(jobs)
+    work = queue.Queue()
+    for job in jobs:
+        work.put(job)
+
+    def run(conn):
+        opened = conn is None
+        if opened:
+            if work.empty():
+                return
+            try:
+                conn = open_ftp(type(ftp), HOST, PORT)
+            except Exception:
+                return
+        try:
+            while not cancelled:
+                try:
+                    local_path, remote_dir, size = work.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    store_file(conn, local_path, remote_dir, progress.add)
+                    progress.finish(local_path.name)
+                except Exception as e:
+                    progress.finish(local_path.name, e)
+        finally:
+            if opened:
+                try:
+                    conn.quit()
+                except:
+                    pass
+
+    count = min(workers, max(len(jobs), 1))
+    threads = [threading.Thread(target=run, args=(ftp if i == 0 else None,), daemon=True)
+               for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return progress.close()
+
+def upload_async(jobs, workers):
+    """Upload a plan with aioftp coroutines over up to `workers` sessions
+
+    aioftp is an optional dependency (pip install aioftp). FTP allows one
+    transfer per control connection, so each concurrent upload borrows its
+    own logged-in client. Returns (success, errors).
+    """
+    try:
+        import aioftp
+    except ImportError:
+        print(f"    {RED}✗ --async requires aioftp (pip install aioftp){RESET}")
+        return 0, 1
+    import asyncio
+
+    progress = BatchProgress(jobs)
+
+    async def run_all():
+        semaphore = asyncio.Semaphore(workers)
+        idle = []
+        opened = []
+        made_dirs = set()
+        dir_lock = asyncio.Lock()
+
+        async def bounded_upload(job):
+            local_path, remote_dir, size = job
+            async with semaphore:
+                if cancelled:
+                    return
+                client = idle.pop() if idle else None
+                try:
+                    if client is None:
+                        client = aioftp.Client()
+                        opened.append(client)
+                        await client.connect(HOST, PORT)
+                        await client.login(USER, PASS)
+                    if remote_dir:
+                        # Serialized so no upload starts before its folder exists
+                        async with dir_lock:
+                            if remote_dir not in made_dirs:
+                                await client.make_directory('/' + remote_dir)
+                                made_dirs.add(remote_dir)
+                    target = f"/{remote_dir}/{local_path.name}" if remote_dir else local_path.name
+                    async with client.upload_stream(target) as stream:
+                        with open_for_upload(local_path) as f:
+                            while not cancelled:
+                                block = f.read(BLOCKSIZE)
+                                if not block:
+                                    break
+                                await stream.write(block)
+                                progress.add(len(block))
+                        if cancelled:
+                            raise Exception("Cancelled")
+                    progress.finish(local_path.name)
+                except Exception as e:
+                    progress.finish(local_path.name, e)
+                    # Don't reuse a session left in an unknown state
+                    if client is not None:
+                        opened.remove(client)
+                        client.close()
+                        client = None
+                finally:
+                    if client is not None:
+                        idle.append(client)
+
+        await asyncio.gather(*(bounded_upload(job) for job in jobs))
+        for client in opened:
+            try:
+                await client.quit()
+            except Exception:
+                client.close()
 
-    total_files = 0
-    total_size = 0
-    for item in path.rglob('*'):
-        if item.is_file():
-            total_files += 1
-            total_size += item.stat().st_size
-    return total_files, total_size
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(run_all())
+    finally:
+        loop.close()
+    return progress.close()
 
 def draw_result_box(success, errors, total_time, was_cancelled=False):
     width = min(get_terminal_width() - 2, 60)
@@ -306,15 +659,267 @@ def draw_result_box(success, errors, total_time, was_cancelled=False):
 
     print(f"  {color}{BOX_BL}{BOX_H * (width - 2)}{BOX_BR}{RESET}")
 
-def send_files(items):
-    global cancelled
+def transfer(ftp, plan, jobs=1, use_async=False):
+    """Upload a plan over a connected ftp, returning (success, errors)"""
+    if use_async:
+        return upload_async(plan, jobs if jobs > 1 else ASYNC_WORKERS)
+    if jobs > 1:
+        return upload_parallel(ftp, plan, jobs)
+
+    success = 0
+    errors = 0
+
+    # Show queue info if multiple files
+    total_files = len(plan)
+    show_queue = total_files > 1
+    current_dir = None
+    failed_dir = None
+
+    for idx, (local_path, remote_dir, size) in enumerate(plan):
+        if cancelled:
+            break
+        if remote_dir == failed_dir:
+            continue
+
+        if remote_dir != current_dir:
+            current_dir = remote_dir
+            if remote_dir:
+                print(f"\n    {BLUE}📁 {BOLD}{remote_dir}/{RESET}")
+
+        queue_info = f"[{idx + 1}/{total_files}]" if show_queue else ""
+
+        try:
+            upload_file(ftp, local_path, remote_dir, queue_info, size)
+            success += 1
+        except Exception as e:
+            if "Cancelled" not in str(e):
+                print(f" {RED}✗ {e}{RESET}")
+                errors += 1
+            # A failure abandons the rest of its folder, or the whole
+            # transfer for a file given on the command line
+            if not remote_dir:
+                break
+            failed_dir = remote_dir
+
+    return success, errors
+
+class ClientOutput:
+    """stdout replacement that streams text to a daemon client"""
+
+    def __init__(self, sock):
+        self.sock = sock
+
+    def write(self, text):
+        global cancelled
+        try:
+            self.sock.sendall(text.encode('utf-8'))
+        except OSError:
+            cancelled = True
+        return len(text)
+
+    def flush(self):
+        pass
+
+def forward_to_daemon(paths, pipeline=False, jobs=1, use_async=False):
+    """Hand the upload to a running `ftpsend --daemon`
+
+    The transfer options travel with the request. Streams the daemon's
+    output to stdout. Returns False when no daemon is listening, so the
+    caller can upload directly.
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(SOCKET_PATH))
+    except OSError:
+        client.close()
+        return False
+
+    with client:
+        request = {'host': HOST, 'port': PORT, 'items': [str(p.absolute()) for p in paths],
+                   'pipeline': pipeline, 'jobs': jobs, 'use_async': use_async}
+        client.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        client.settimeout(0.2)
+        stop_sent = False
+        while True:
+            if cancelled and not stop_sent:
+                # Closing our side tells the daemon to cancel
+                client.shutdown(socket.SHUT_WR)
+                stop_sent = True
+            try:
+                data = client.recv(65536)
+            except socket.timeout:
+                continue
+            if not data:
+                break
+            sys.stdout.buffer.write(data)
+            sys.stdout.flush()
+    return True
+
+def run_daemon(pipeline=False, jobs=1, use_async=False):
+    """Serve uploads from ftpsend clients over one persistent FTP session
+
+    Listens on SOCKET_PATH and sends a NOOP every KEEPALIVE_INTERVAL seconds
+    of inactivity so the server does not drop the idle session. The session
+    is opened lazily and reopened after any FTP error. The options given
+    here are defaults for requests that do not carry their own.
+    """
+    global cancelled, HOST, PORT
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    HOST, PORT = load_config()
+    ftp = None
+    server_addr = None
+
+    def close_ftp():
+        try:
+            ftp.close()
+        except:
+            pass
+
+    try:
+        SOCKET_PATH.unlink()
+    except FileNotFoundError:
+        pass
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(SOCKET_PATH))
+    server.listen(1)
+    server.settimeout(KEEPALIVE_INTERVAL)
+    print(f"  {GREEN}✓{RESET} ftpsend daemon listening on {SOCKET_PATH} {DIM}(Ctrl+C to stop){RESET}")
+
+    try:
+        while True:
+            try:
+                client, _ = server.accept()
+            except socket.timeout:
+                if ftp is not None:
+                    try:
+                        ftp.voidcmd('NOOP')
+                    except ftplib.all_errors:
+                        close_ftp()
+                        ftp = None
+                continue
+
+            with client:
+                try:
+                    request = json.loads(client.makefile('r', encoding='utf-8').readline())
+                    paths = [Path(item) for item in request.get('items', [])]
+                    addr = (request.get('host', HOST), request.get('port', PORT))
+                    ftp_class = PipelinedFTP if request.get('pipeline', pipeline) else TunedFTP
+                    request_jobs = max(1, int(request.get('jobs', jobs)))
+                    request_async = bool(request.get('use_async', use_async))
+                except (ValueError, TypeError, AttributeError) as e:
+                    # A malformed request fails only that client
+                    try:
+                        client.sendall(f"    {RED}✗ Bad request: {e}{RESET}\n".encode('utf-8'))
+                    except OSError:
+                        pass
+                    continue
+                # Extra --jobs/--async sessions connect to HOST:PORT
+                HOST, PORT = addr
+
+                # Any data or EOF from the client means "cancel"
+                cancelled = False
+                def watch():
+                    global cancelled
+                    try:
+                        client.recv(1)
+                    except OSError:
+                        pass
+                    cancelled = True
+                watcher = threading.Thread(target=watch, daemon=True)
+                watcher.start()
+
+                out = ClientOutput(client)
+                with contextlib.redirect_stdout(out):
+                    print()
+                    draw_section("TRANSFERRING", GREEN)
+                    start = time.time()
+                    try:
+                        if ftp is not None and (addr != server_addr or type(ftp) is not ftp_class):
+                            close_ftp()
+                            ftp = None
+                        if ftp is not None:
+                            try:
+                                ftp.voidcmd('NOOP')
+                            except ftplib.all_errors:
+                                close_ftp()
+                                ftp = None
+                        if ftp is None:
+                            ftp = open_ftp(ftp_class, *addr)
+                            server_addr = addr
+                            save_config(*addr)
+                        else:
+                            # Directories may have changed since the last request
+                            ftp.known_dirs.clear()
+                        plan = build_work_list(paths)
+                        success, errors = transfer(ftp, plan, request_jobs, request_async)
+                        draw_result_box(success, errors, time.time() - start, cancelled)
+                    except Exception as e:
+                        print(f"    {RED}✗ Transfer error: {e}{RESET}")
+                        if ftp is not None:
+                            close_ftp()
+                            ftp = None
+                    if cancelled and ftp is not None:
+                        # The session state after an aborted transfer is unknown
+                        close_ftp()
+                        ftp = None
+
+                try:
+                    client.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                watcher.join()
+                cancelled = False
+    except KeyboardInterrupt:
+        print()
+    finally:
+        server.close()
+        try:
+            SOCKET_PATH.unlink()
+        except FileNotFoundError:
+            pass
+        if ftp is not None:
+            try:
+                ftp.quit()
+            except:
+                close_ftp()
+
+def parse_args(argv):
+    """Split command line into paths and option flags"""
+    items = []
+    options = {'pipeline': False, 'jobs': 1, 'use_async': False, 'daemon': False}
+    args = iter(argv)
+    for arg in args:
+        if arg == '--pipeline':
+            options['pipeline'] = True
+        elif arg == '--async':
+            options['use_async'] = True
+        elif arg == '--daemon':
+            options['daemon'] = True
+        elif arg in ('-h', '--help'):
+            print(__doc__.strip())
+            sys.exit(0)
+        elif arg in ('-j', '--jobs') or arg.startswith('--jobs='):
+            value = arg.split('=', 1)[1] if '=' in arg else next(args, '1')
+            try:
+                options['jobs'] = max(1, int(value))
+            except ValueError:
+                pass
+        else:
+            items.append(arg)
+    return items, options
+
+def send_files(items, pipeline=False, jobs=1, use_async=False):
+    global cancelled, HOST, PORT
+    signal.signal(signal.SIGINT, handle_cancel)
+    if items:
+        HOST, PORT = load_config()
     clear_screen()
     draw_header()
 
     print(f"  {DIM}(Press Ctrl+C to cancel transfer){RESET}\n")
 
     if not items:
-        print(f"  {YELLOW}Usage: ftpsend <file1> [folder1] [file2] ...{RESET}")
+        print(f"  {YELLOW}Usage: ftpsend [--pipeline] [--jobs N] [--async] <file1> [folder1] [file2] ...{RESET}")
         print(f"\n  {DIM}Press Enter to close...{RESET}")
         input()
         sys.exit(1)
@@ -334,23 +939,32 @@ def send_files(items):
         input()
         sys.exit(1)
 
-    # Calculate total stats
-    total_files = 0
+    # Walk each item once; the same plan drives the transfer
+    plan = []
     total_size = 0
-    for path in valid_items:
-        files, size = collect_stats(path)
-        total_files += files
-        total_size += size
-
     draw_section("FILES TO SEND")
     for path in valid_items:
+        entries = plan_path(path)
+        files = len(entries)
+        size = sum(entry[2] for entry in entries)
+        plan.extend(entries)
+        total_size += size
         if path.is_dir():
-            files, size = collect_stats(path)
             print(f"    {BLUE}📁{RESET} {path.name}/ {DIM}({files} files, {format_size(size)}){RESET}")
         else:
-            print(f"    {WHITE}📄{RESET} {path.name} {DIM}({format_size(path.stat().st_size)}){RESET}")
+            print(f"    {WHITE}📄{RESET} {path.name} {DIM}({format_size(size)}){RESET}")
 
-    print(f"\n    {DIM}Total: {total_files} file(s), {format_size(total_size)}{RESET}")
+    print(f"\n    {DIM}Total: {len(plan)} file(s), {format_size(total_size)}{RESET}")
+
+    # Reuse the persistent session of a running daemon if there is one
+    if forward_to_daemon(valid_items, pipeline, jobs, use_async):
+        if cancelled:
+            print(f"\n  {DIM}Closing...{RESET}")
+            time.sleep(1)
+        else:
+            print(f"\n  {DIM}Press Enter to close...{RESET}")
+            input()
+        return
 
     # Connect with retry option
     ftp = None
@@ -362,9 +976,7 @@ def send_files(items):
         overall_start = time.time()
 
         try:
-            ftp = ftplib.FTP()
-            ftp.connect(HOST, PORT, timeout=10)
-            ftp.login(USER, PASS)
+            ftp = open_ftp(PipelinedFTP if pipeline else TunedFTP, HOST, PORT)
             print(f"    {GREEN}✓{RESET} Connected successfully!\n")
 
             # Save successful connection
@@ -394,34 +1006,8 @@ def send_files(items):
     # Transfer files
     draw_section("TRANSFERRING", GREEN)
 
-    success = 0
-    errors = 0
-
-    # Show queue info if multiple items
-    total_items = len(valid_items)
-    show_queue = total_items > 1
-
     try:
-        for idx, path in enumerate(valid_items):
-            if cancelled:
-                break
-
-            # Generate queue info
-            queue_info = f"[{idx + 1}/{total_items}]" if show_queue else ""
-
-            if path.is_file():
-                try:
-                    upload_file(ftp, path, queue_info=queue_info)
-                    success += 1
-                except Exception as e:
-                    if "Cancelled" not in str(e):
-                        print(f" {RED}✗ {e}{RESET}")
-                        errors += 1
-                    break
-            elif path.is_dir():
-                uploaded, errs = upload_folder(ftp, path, queue_info=queue_info)
-                success += uploaded
-                errors += errs
+        success, errors = transfer(ftp, plan, jobs, use_async)
 
         try:
             ftp.quit()
@@ -452,4 +1038,8 @@ def send_files(items):
         sys.exit(1)
 
 if __name__ == "__main__":
-    send_files(sys.argv[1:])
+    items, options = parse_args(sys.argv[1:])
+    if options.pop('daemon'):
+        run_daemon(**options)
+    else:
+        send_files(items, **options)
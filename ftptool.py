@@ -7,11 +7,18 @@ import os
 import sys
 import curses
 import ftplib
+import select
+import socket
 import tempfile
 import subprocess
 import threading
+import queue
 import time
 import json
+import re
+import stat
+from bisect import bisect_right
+from functools import lru_cache
 from pathlib import Path
 
 # Config file to remember last successful connection
@@ -23,6 +30,54 @@ DEFAULT_PORT = 9999
 DEFAULT_USER = "anonymous"
 DEFAULT_PASS = ""
 
+# Block size for file transfers
+FTP_BLOCKSIZE = 262144
+
+# Send/receive buffer for control and data sockets
+SOCKET_BUFFER = 4 << 20
+
+# Seconds between publishing transfer progress to the UI
+PROGRESS_INTERVAL = 0.05
+
+# Minimum seconds between progress-only redraws (10 Hz)
+DRAW_INTERVAL = 0.1
+
+# Unix-style LIST line: perms, links, owner, group, size, 3 date fields, name
+_LIST_RE = re.compile(r'^(?P<perms>\S+)(?:\s+\S+){3}\s+(?P<size>\d+)(?:\s+\S+){3}\s+(?P<name>.+)$')
+
+# Units for format_size, one per factor of 1024
+_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# Formatted sizes kept per FTPManager before the cache starts over
+SIZE_CACHE_MAX = 4096
+
+# Widest progress bar, and every bar up to it: the one with n cells filled
+# is BAR_CELLS[BAR_WIDTH - n:][:width]
+BAR_WIDTH = 30
+BAR_CELLS = '█' * BAR_WIDTH + '░' * BAR_WIDTH
+
+# Help bar text by (connected, mode); the mode does not matter offline
+HELP_TEXTS = {
+    (True, "remote"): " ↑↓:Nav │ Space:Mark │ d:Down │ D:Del │ /:Search │ v:View │ e:Edit │ Tab:Local │ c:Disc │ q:Quit ",
+    (True, "local"): " ↑↓:Nav │ Space:Mark │ u:Upload │ D:Del │ /:Search │ Tab:Remote │ c:Disc │ q:Quit ",
+    (False, None): " c:Connect │ s:Set Server │ Tab:Switch View │ q:Quit ",
+}
+
+# Size column shown for directories
+DIR_SIZE_STR = "     <DIR>"
+
+# Concurrent sessions for folder uploads
+FOLDER_UPLOAD_WORKERS = 4
+
+# Seconds a kept transfer session may idle before it is checked with NOOP
+TRANSFER_IDLE_CHECK = 30
+
+# Milliseconds getch() waits for a key while a transfer runs
+INPUT_POLL_MS = 33
+
+# Write buffer for downloaded files
+WRITE_BUFFER = 1 << 20
+
 # Load last successful connection or use defaults
 def load_config():
     if CONFIG_FILE.exists():
@@ -42,17 +97,281 @@ def save_config(host, port):
     except:
         pass
 
+def format_size(size):
+    shift = min(max((int(size).bit_length() - 1) // 10, 0), len(_UNITS) - 1)
+    return f"{size / (1 << (shift * 10)):>7.1f} {_UNITS[shift]}"
+
+@lru_cache(maxsize=16)
+def help_row(key, w):
+    """HELP_TEXTS[key] centred for a w-column screen"""
+    return HELP_TEXTS[key].center(w)[:w-1]
+
+@lru_cache(maxsize=32)
+def modal_borders(modal_width, title):
+    """Top (titled), empty and bottom rows of a confirm box modal_width wide"""
+    left = (modal_width - len(title) - 4) // 2
+    right = modal_width - len(title) - 4 - left
+    top = ("╔" + "═" * left + f" {title} " + "═" * right + "╗")[:modal_width]
+    empty = "║" + " " * (modal_width - 2) + "║"
+    bottom = "╚" + "═" * (modal_width - 2) + "╝"
+    return top, empty, bottom
+
+def advise_sequential(f):
+    """Hint the kernel that f is read or written once, front to back"""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+def open_for_upload(path):
+    """Open a file for sendfile(): unbuffered, since the kernel does the reading"""
+    f = open(path, 'rb', buffering=0)
+    advise_sequential(f)
+    return f
+
+def open_for_download(path):
+    """Open a file for a download with a large write buffer"""
+    f = open(path, 'wb', buffering=WRITE_BUFFER)
+    advise_sequential(f)
+    return f
+
+def tune_socket(sock):
+    """Disable Nagle and enlarge the socket buffers on a connected socket"""
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER)
+    except OSError:
+        pass
+
+class TunedFTP(ftplib.FTP):
+    """FTP client that tunes the control and every data connection"""
+
+    def connect(self, *args, **kwargs):
+        welcome = super().connect(*args, **kwargs)
+        tune_socket(self.sock)
+        return welcome
+
+    def ntransfercmd(self, cmd, rest=None):
+        conn, size = super().ntransfercmd(cmd, rest)
+        tune_socket(conn)
+        return conn, size
+
+    def storfile(self, cmd, fp, callback=None):
+        """Like storbinary, but the kernel copies the file (sendfile)
+
+        callback gets the number of bytes sent for each block.
+        """
+        self.voidcmd('TYPE I')
+        with self.transfercmd(cmd) as conn:
+            offset = 0
+            while True:
+                sent = conn.sendfile(fp, offset, FTP_BLOCKSIZE)
+                if not sent:
+                    break
+                offset += sent
+                if callback:
+                    callback(sent)
+        return self.voidresp()
+
+    def retrfile(self, cmd, fp, callback=None):
+        """Like retrbinary, but the data goes straight into the file fp
+
+        Uses splice() where the platform has it and a reused receive buffer
+        otherwise. callback gets the number of bytes received for each block.
+        """
+        self.voidcmd('TYPE I')
+        with self.transfercmd(cmd) as conn:
+            if not (hasattr(os, 'splice') and self.splice_to_file(conn, fp, callback)):
+                self.recv_to_file(conn, fp, callback)
+        return self.voidresp()
+
+    def recv_to_file(self, conn, fp, callback=None):
+        """Copy the data connection into fp through one bytearray"""
+        buf = bytearray(FTP_BLOCKSIZE)
+        view = memoryview(buf)
+        while True:
+            received = conn.recv_into(buf)
+            if not received:
+                break
+            fp.write(view[:received])
+            if callback:
+                callback(received)
+
+    def splice_to_file(self, conn, fp, callback=None):
+        """Move the data connection into fp inside the kernel (Linux splice)
+
+        Bytes go socket -> pipe -> file without entering Python. Returns
+        False, having read nothing, when splice does not work for this pair.
+        """
+        import fcntl
+
+        fp.flush()
+        read_end, write_end = os.pipe()
+        try:
+            try:
+                fcntl.fcntl(write_end, fcntl.F_SETPIPE_SZ, FTP_BLOCKSIZE)
+            except (AttributeError, OSError):
+                pass
+            # Sockets with a timeout are non-blocking underneath
+            timeout = conn.gettimeout()
+            started = False
+            while True:
+                try:
+                    received = os.splice(conn.fileno(), write_end, FTP_BLOCKSIZE)
+                except BlockingIOError:
+                    if not select.select([conn], [], [], timeout)[0]:
+                        raise socket.timeout("timed out")
+                    continue
+                except OSError:
+                    if started:
+                        raise
+                    return False
+                started = True
+                if not received:
+                    return True
+                left = received
+                while left:
+                    left -= os.splice(read_end, fp.fileno(), left)
+                if callback:
+                    callback(received)
+        finally:
+            os.close(read_end)
+            os.close(write_end)
+
+class Listing:
+    """Directory entries stored column-wise, one list per field
+
+    The draw loop reads the columns directly; indexing or iterating gives
+    the usual entry dicts for everything else.
+    """
+
+    def __init__(self, entries=()):
+        self.names = []
+        self.sizes = []
+        self.is_dir = []
+        self.perms = []
+        self.paths = []
+        self.size_strs = []
+        self._row_text = []
+        self._row_width = None
+        self._search_text = None  # Lowercased names joined by newlines
+        self._search_starts = []
+        for entry in entries:
+            self.append(entry)
+
+    def append(self, entry):
+        self.names.append(entry['name'])
+        self.sizes.append(entry['size'])
+        self.is_dir.append(entry['is_dir'])
+        self.perms.append(entry.get('perms', ''))
+        self.paths.append(entry.get('path'))
+        self.size_strs.append(entry['size_str'])
+        self._row_width = None
+        self._search_text = None
+
+    def find(self, query):
+        """Indices of entries (not '..') whose name contains query, ignoring case
+
+        Searches one newline-joined string of the lowercased names, built on
+        first use, so the scanning happens in str.find.
+        """
+        if self._search_text is None:
+            lowered = [name.lower() for name in self.names]
+            self._search_starts = starts = []
+            pos = 0
+            for name in lowered:
+                starts.append(pos)
+                pos += len(name) + 1
+            self._search_text = "\n".join(lowered)
+        text, starts = self._search_text, self._search_starts
+        query = query.lower()
+        matches = []
+        pos = text.find(query)
+        while pos >= 0:
+            idx = bisect_right(starts, pos) - 1
+            if self.names[idx] != '..':
+                matches.append(idx)
+            if idx + 1 == len(starts):
+                break
+            pos = text.find(query, starts[idx + 1])
+        return matches
+
+    def columns(self):
+        return (self.names, self.sizes, self.is_dir, self.perms, self.paths, self.size_strs)
+
+    def with_entry(self, entry):
+        """A copy with entry added in sort order, replacing any entry of the same name
+
+        Returns a new Listing, so whoever holds the old one can tell it changed.
+        """
+        new = Listing()
+        new.names, new.sizes, new.is_dir, new.perms, new.paths, new.size_strs = (
+            column[:] for column in self.columns())
+        if entry['name'] in new.names:
+            idx = new.names.index(entry['name'])
+            for column in new.columns():
+                del column[idx]
+        # Same order as the refreshes: '..' first, then directories, then by name
+        key = (not entry['is_dir'], entry['name'].lower())
+        idx = 0
+        while idx < len(new.names) and (new.names[idx] == '..' or
+                                        (not new.is_dir[idx], new.names[idx].lower()) < key):
+            idx += 1
+        values = (entry['name'], entry['size'], entry['is_dir'], entry.get('perms', ''),
+                  entry.get('path'), entry['size_str'])
+        for column, value in zip(new.columns(), values):
+            column.insert(idx, value)
+        return new
+
+    def rows(self, width):
+        """Padded row text for a pane width columns wide, less the 2-column mark
+
+        Built once per listing and width, so drawing only prepends the mark.
+        """
+        if self._row_width != width:
+            room = width - 4
+            self._row_text = []
+            for name, is_dir, size_str in zip(self.names, self.is_dir, self.size_strs):
+                text = "📁 " + name + "/" if is_dir else "📄 " + name
+                if room - len(text) - len(size_str) > 0:
+                    text = text.ljust(room - len(size_str)) + size_str + " "
+                else:
+                    text = text[:width - 3]
+                self._row_text.append(text)
+            self._row_width = width
+        return self._row_text
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, idx):
+        return {
+            'name': self.names[idx],
+            'size': self.sizes[idx],
+            'is_dir': self.is_dir[idx],
+            'perms': self.perms[idx],
+            'path': self.paths[idx],
+            'size_str': self.size_strs[idx],
+        }
+
+    def __iter__(self):
+        return map(self.__getitem__, range(len(self.names)))
+
+
 class FTPManager:
     def __init__(self, stdscr):
         self.stdscr = stdscr
         self.ftp = None
         self.connected = False
+        self.use_mlsd = True  # Cleared when the server rejects MLSD
         # Load last successful connection
         self.host, self.port = load_config()
         self.local_dir = Path.home() / "Downloads"  # Start in Downloads
         self.remote_dir = "/"
-        self.remote_files = []
-        self.local_files = []
+        self.remote_files = Listing()
+        self.local_files = Listing()
         self.cursor = 0
         self.scroll_offset = 0
         self.mode = "remote"  # "remote" or "local"
@@ -73,11 +392,56 @@ class FTPManager:
         self.transfer_filename = ""
         self.transfer_action = ""
         self.transfer_cancelled = False
-        self.transfer_thread = None
+
+        # One long-lived worker runs transfer jobs in order. Only it writes the
+        # transfer_* counters while a job runs; the UI thread just reads them.
+        self.transfer_jobs = queue.Queue()
+        threading.Thread(target=self.transfer_loop, daemon=True).start()
+        # Changes to UI state posted by transfer threads, applied by run()
+        self.ui_events = queue.Queue()
         self.transfer_start_time = 0
         self.transfer_last_progress = 0
         self.transfer_last_time = 0
         self.transfer_speed = 0
+        self._unreported = 0
+        self._last_report = 0.0
+        self.progress_lock = threading.Lock()  # Folder uploads count from several threads
+
+        # Session kept open between background transfers (worker thread only)
+        self.transfer_ftp = None
+        self.transfer_ftp_addr = None
+        self.transfer_ftp_cwd = None
+        self.transfer_ftp_used = 0.0
+        self.transfer_lock = threading.Lock()
+
+        # Redraw throttling: progress only redraws when dirty and not too soon
+        self._progress_dirty = False
+        self._last_draw = 0.0
+        self._size_strs = {}  # format_size() cache, see format_size
+        self._last_progress_sig = None
+
+        # What draw() last put on each screen row, so unchanged rows are skipped
+        self._rows = {}
+        self._rows_size = None
+
+        # Header, file list and status regions as (top row, window), and the
+        # ones written to since they were last copied to the screen
+        self._windows = []
+        self._touched = set()
+        self._drawn_list = None
+        self._frame_sig = None  # State the last full frame showed
+        self._input_timeout = -1  # curses default: getch() blocks
+
+        # With --rep the progress bar fill is sent as "cell + repeat" escapes
+        # behind curses' back; _rep_bar is the (row, column, filled, width)
+        # to send after the next update, and _rep_row the row that has one
+        self.use_rep = False
+        self._rep_bar = None
+        self._rep_row = None
+
+        # Key code -> action, and whether run() keeps going
+        self.keymap = self.build_keymap()
+        self.running = True
 
         # Initialize curses
         curses.start_color()
@@ -107,56 +471,136 @@ class FTPManager:
         self.stdscr.keypad(True)
 
     def format_size(self, size):
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024:
-                return f"{size:>7.1f} {unit}"
-            size /= 1024
-        return f"{size:>7.1f} TB"
+        """Cached format_size(), for sizes that get shown again (listings, totals)"""
+        size_str = self._size_strs.get(size)
+        if size_str is None:
+            if len(self._size_strs) >= SIZE_CACHE_MAX:
+                self._size_strs.clear()
+            size_str = self._size_strs[size] = format_size(size)
+        return size_str
 
     def set_message(self, msg, msg_type="info"):
         self.message = msg
         self.message_type = msg_type
+        self._progress_dirty = True
+
+    def add_progress(self, count):
+        """Count transferred bytes, publishing them every PROGRESS_INTERVAL"""
+        with self.progress_lock:
+            self._unreported += count
+            now = time.monotonic()
+            due = now - self._last_report >= PROGRESS_INTERVAL
+            if due:
+                self._last_report = now
+        if due:
+            self.flush_progress(now)
+
+    def flush_progress(self, now=None):
+        """Publish bytes counted since the last update, and the speed every 0.5s
+
+        Times are monotonic, so a clock change cannot give a negative speed.
+        """
+        if now is None:
+            now = time.monotonic()
+        with self.progress_lock:
+            self.transfer_progress += self._unreported
+            self._unreported = 0
+            elapsed = now - self.transfer_last_time
+            if elapsed >= 0.5:
+                self.transfer_speed = (self.transfer_progress - self.transfer_last_progress) / elapsed
+                self.transfer_last_progress = self.transfer_progress
+                self.transfer_last_time = now
+        self._progress_dirty = True
 
     def parse_list_line(self, line):
-        parts = line.split(None, 8)
-        if len(parts) >= 9:
-            return {
-                'name': parts[8],
-                'size': int(parts[4]) if parts[4].isdigit() else 0,
-                'is_dir': parts[0].startswith('d'),
-                'perms': parts[0],
-            }
-        return None
+        m = _LIST_RE.match(line)
+        if not m:
+            return None
+        perms = m.group('perms')
+        is_dir = perms[0] == 'd'
+        size = int(m.group('size'))
+        return {
+            'name': m.group('name'),
+            'size': size,
+            'is_dir': is_dir,
+            'perms': perms,
+            'size_str': DIR_SIZE_STR if is_dir else self.format_size(size),
+        }
+
+    def fetch_lines(self, cmd):
+        """Run a listing command and return its lines
+
+        The reply is read in large binary blocks and split once, instead of
+        retrlines' callback and decode per line.
+        """
+        buf = bytearray()
+        self.ftp.retrbinary(cmd, buf.extend, blocksize=65536)
+        return buf.decode(self.ftp.encoding, errors='replace').splitlines()
+
+    def list_remote(self, path=""):
+        """List a remote directory (default: current), using MLSD when the server has it"""
+        if self.use_mlsd:
+            try:
+                entries = []
+                for line in self.fetch_lines(f"MLSD {path}" if path else "MLSD"):
+                    # "fact=value;fact=value; name", as parsed by ftplib.mlsd
+                    facts_str, _, name = line.partition(' ')
+                    facts = {}
+                    for fact in facts_str[:-1].split(';'):
+                        key, _, value = fact.partition('=')
+                        facts[key.lower()] = value
+                    kind = facts.get('type', '')
+                    if kind in ('cdir', 'pdir'):
+                        continue
+                    is_dir = kind == 'dir'
+                    size = 0 if is_dir else int(facts.get('size', 0))
+                    entries.append({
+                        'name': name,
+                        'size': size,
+                        'is_dir': is_dir,
+                        'perms': facts.get('perm', ''),
+                        'size_str': DIR_SIZE_STR if is_dir else self.format_size(size),
+                    })
+                return entries
+            except ftplib.error_perm as e:
+                # 500/501/502: command not understood or not implemented
+                if not str(e).startswith('50'):
+                    raise
+                self.use_mlsd = False
+
+        lines = self.fetch_lines(f"LIST {path}" if path else 'LIST')
+        return [parsed for parsed in map(self.parse_list_line, lines) if parsed]
 
     def refresh_remote(self):
         if not self.connected:
-            self.remote_files = []
+            self.remote_files = Listing()
             return
         try:
-            self.remote_files = [{'name': '..', 'is_dir': True, 'size': 0, 'perms': ''}]
-            items = []
-            self.ftp.retrlines('LIST', items.append)
-            for item in items:
-                parsed = self.parse_list_line(item)
-                if parsed:
-                    self.remote_files.append(parsed)
             # Sort: directories first
-            self.remote_files[1:] = sorted(self.remote_files[1:],
-                key=lambda x: (not x['is_dir'], x['name'].lower()))
+            entries = sorted(self.list_remote(), key=lambda x: (not x['is_dir'], x['name'].lower()))
+            self.remote_files = Listing([{'name': '..', 'is_dir': True, 'size': 0, 'size_str': DIR_SIZE_STR}])
+            for entry in entries:
+                self.remote_files.append(entry)
             self.remote_dir = self.ftp.pwd()
         except Exception as e:
             self.set_message(f"Error: {e}", "error")
 
     def refresh_local(self):
         try:
-            self.local_files = [{'name': '..', 'is_dir': True, 'size': 0, 'path': self.local_dir.parent}]
-            items = sorted(self.local_dir.iterdir(), key=lambda x: (x.is_file(), x.name.lower()))
+            self.local_files = Listing([{'name': '..', 'is_dir': True, 'size': 0, 'path': self.local_dir.parent,
+                                         'size_str': DIR_SIZE_STR}])
+            # DirEntry caches the type from readdir, so only files cost a stat()
+            with os.scandir(self.local_dir) as it:
+                items = sorted(it, key=lambda x: (x.is_file(), x.name.lower()))
             for item in items:
+                is_dir = item.is_dir()
+                size = item.stat().st_size if item.is_file() else 0
                 self.local_files.append({
                     'name': item.name,
-                    'is_dir': item.is_dir(),
-                    'size': item.stat().st_size if item.is_file() else 0,
-                    'path': item
+                    'is_dir': is_dir,
+                    'size': size,
+                    'path': Path(item.path),
+                    'size_str': DIR_SIZE_STR if is_dir else self.format_size(size),
                 })
         except PermissionError:
             self.set_message("Permission denied", "error")
@@ -164,6 +608,10 @@ class FTPManager:
     def get_current_list(self):
         return self.remote_files if self.mode == "remote" else self.local_files
 
+    def last_index(self):
+        """Index of the last entry in the current view (0 when empty)"""
+        return max(len(self.get_current_list()) - 1, 0)
+
     def get_selected_item(self):
         items = self.get_current_list()
         if 0 <= self.cursor < len(items):
@@ -216,10 +664,17 @@ class FTPManager:
         try:
             self.set_message(f"Connecting to {self.host}:{self.port}...", "info")
             self.draw()
-            self.ftp = ftplib.FTP()
+            self.ftp = TunedFTP()
             self.ftp.connect(self.host, self.port, timeout=10)
             self.ftp.login(DEFAULT_USER, DEFAULT_PASS)
             self.connected = True
+            self.use_mlsd = True
+            # Ask once per session for just the facts the listing shows; a
+            # server that refuses keeps its default facts (MLSD still works)
+            try:
+                self.ftp.sendcmd("OPTS MLST type;size;perm;")
+            except ftplib.all_errors:
+                pass
             # Save successful connection
             save_config(self.host, self.port)
             self.refresh_remote()
@@ -230,15 +685,112 @@ class FTPManager:
             self.set_message(f"Connection failed: {e}", "error")
             self.connected = False
 
+    def transfer_loop(self):
+        """Run submitted transfer jobs one after another (worker thread)"""
+        while True:
+            job = self.transfer_jobs.get()
+            try:
+                job()
+            except Exception as e:
+                # Report it and keep serving the jobs queued behind it
+                self.post(self.transfer_failed, e)
+            finally:
+                self.transfer_jobs.task_done()
+
+    def transfer_failed(self, error):
+        """Report a job that raised past its own handling (UI thread)"""
+        self.transfer_active = False
+        self.set_message(f"Transfer failed: {error}", "error")
+
+    def submit_transfer(self, job):
+        """Queue a transfer job for the worker; jobs may submit follow-ups"""
+        self.transfer_jobs.put(job)
+
+    def transfer_busy(self):
+        """True while a transfer job is queued or running"""
+        return self.transfer_jobs.unfinished_tasks > 0
+
+    def post(self, fn, *args):
+        """Have the UI thread call fn(*args) on its next tick"""
+        self.ui_events.put((fn, args))
+        self._progress_dirty = True
+
+    def pump(self):
+        """Apply the changes transfer threads posted (UI thread)"""
+        while True:
+            try:
+                fn, args = self.ui_events.get_nowait()
+            except queue.Empty:
+                return
+            fn(*args)
+
+    def add_entry(self, remote, directory, entry):
+        """Put a transferred entry into the listing of directory, if it is still shown
+
+        Saves listing the whole directory again after each transfer.
+        """
+        if remote:
+            if self.connected and self.remote_dir == directory:
+                self.remote_files = self.remote_files.with_entry(entry)
+        elif self.local_dir == directory:
+            self.local_files = self.local_files.with_entry(entry)
+
+    def get_transfer_ftp(self):
+        """Return the logged-in transfer session, opening it on first use
+
+        Kept across transfers so queued files skip connect and login. It is
+        reopened when the server address changed, and probed with NOOP after
+        idling for TRANSFER_IDLE_CHECK seconds.
+        """
+        ftp = self.transfer_ftp
+        if ftp is not None and self.transfer_ftp_addr != (self.host, self.port):
+            self.close_transfer_ftp()
+            ftp = None
+        if ftp is not None and time.monotonic() - self.transfer_ftp_used > TRANSFER_IDLE_CHECK:
+            try:
+                ftp.voidcmd('NOOP')
+            except ftplib.all_errors:
+                self.close_transfer_ftp()
+                ftp = None
+        if ftp is None:
+            ftp = TunedFTP()
+            ftp.connect(self.host, self.port, timeout=30)
+            ftp.login(DEFAULT_USER, DEFAULT_PASS)
+            self.transfer_ftp = ftp
+            self.transfer_ftp_addr = (self.host, self.port)
+            self.transfer_ftp_cwd = None
+        self.transfer_ftp_used = time.monotonic()
+        return ftp
+
+    def transfer_cwd(self, path):
+        """CWD the transfer session unless it is already in path"""
+        if path != self.transfer_ftp_cwd:
+            self.transfer_ftp.cwd(path)
+            self.transfer_ftp_cwd = path
+
+    def close_transfer_ftp(self, polite=False):
+        """Drop the transfer session, e.g. after an error left it in an unknown state"""
+        ftp = self.transfer_ftp
+        self.transfer_ftp = None
+        self.transfer_ftp_cwd = None
+        if ftp is not None:
+            try:
+                ftp.quit() if polite else ftp.close()
+            except:
+                pass
+
     def disconnect(self):
         if self.ftp:
             try:
                 self.ftp.quit()
             except:
                 pass
+        # Close the transfer session on the worker, behind any queued jobs,
+        # so it is never pulled from under a transfer
+        self.submit_transfer(lambda: self.close_transfer_ftp(polite=True))
         self.ftp = None
         self.connected = False
-        self.remote_files = []
+        self.remote_files = Listing()
         self.set_message("Disconnected", "info")
 
     def enter_directory(self):
@@ -322,20 +874,27 @@ class FTPManager:
             self.process_upload_queue()
 
     def process_upload_queue(self):
-        """Process the upload queue one file at a time"""
-        if self.current_queue_index >= len(self.transfer_queue):
-            # Queue finished
-            self.set_message(f"Uploaded {len(self.transfer_queue)} file(s)", "success")
-            self.transfer_queue = []
-            self.refresh_remote()
-            return
+        """Start the next file of the upload queue (UI thread)"""
+        while True:
+            if self.current_queue_index >= len(self.transfer_queue):
+                # Queue finished
+                self.set_message(f"Uploaded {len(self.transfer_queue)} file(s)", "success")
+                self.transfer_queue = []
+                return
 
-        item = self.transfer_queue[self.current_queue_index]
-        filepath = item['path']
-        file_size = filepath.stat().st_size
-        filename = item['name']
+            item = self.transfer_queue[self.current_queue_index]
+            filepath = item['path']
+            filename = item['name']
+            try:
+                file_size = filepath.stat().st_size
+                break
+            except OSError as e:
+                # Gone since it was queued: report it and go on with the rest
+                self.set_message(f"Upload failed ({filename}): {e}", "error")
+                self.current_queue_index += 1
 
         queue_info = f"[{self.current_queue_index + 1}/{len(self.transfer_queue)}]"
+        remote_dir = self.remote_dir
 
         # Setup transfer state
         self.transfer_active = True
@@ -344,46 +903,116 @@ class FTPManager:
         self.transfer_filename = f"{queue_info} {filename}"
         self.transfer_action = "Uploading"
         self.transfer_cancelled = False
-        self.transfer_start_time = time.time()
-        self.transfer_last_time = time.time()
+        self.transfer_start_time = time.monotonic()
+        self.transfer_last_time = self.transfer_start_time
         self.transfer_last_progress = 0
         self.transfer_speed = 0
+        self._unreported = 0
 
         def do_upload():
-            try:
-                # Create a new FTP connection for the transfer
-                transfer_ftp = ftplib.FTP()
-                transfer_ftp.connect(self.host, self.port, timeout=30)
-                transfer_ftp.login(DEFAULT_USER, DEFAULT_PASS)
-                transfer_ftp.cwd(self.remote_dir)
-
-                def callback(data):
-                    if self.transfer_cancelled:
-                        raise Exception("Cancelled by user")
-                    self.transfer_progress += len(data)
+            def callback(sent):
+                if self.transfer_cancelled:
+                    raise Exception("Cancelled by user")
+                self.add_progress(sent)
 
-                with open(filepath, 'rb') as f:
-                    transfer_ftp.storbinary(f"STOR {filename}", f, blocksize=8192, callback=callback)
+            try:
+                with self.transfer_lock:
+                    try:
+                        transfer_ftp = self.get_transfer_ftp()
+                        self.transfer_cwd(remote_dir)
+                        with open_for_upload(filepath) as f:
+                            transfer_ftp.storfile(f"STOR {filename}", f, callback=callback)
+                    except Exception:
+                        self.close_transfer_ftp()
+                        raise
+                self.flush_progress()
+            except Exception as e:
+                self.post(self.finish_upload, remote_dir, filename, file_size, e)
+            else:
+                self.post(self.finish_upload, remote_dir, filename, file_size, None)
 
-                transfer_ftp.quit()
+        self.submit_transfer(do_upload)
 
-                # Move to next file in queue (will set transfer_active=False if done)
-                self.transfer_active = False  # Turn off before starting next
-                self.current_queue_index += 1
-                self.process_upload_queue()
+    def finish_upload(self, remote_dir, filename, file_size, error):
+        """Apply one finished queued upload and start the next (UI thread)"""
+        self.transfer_active = False
+        if error is None:
+            self.add_entry(True, remote_dir, {
+                'name': filename, 'size': file_size, 'is_dir': False,
+                'size_str': self.format_size(file_size)})
+        elif "Cancelled" in str(error):
+            self.set_message("Upload cancelled", "info")
+            self.transfer_queue = []  # Clear queue on cancel
+            return
+        else:
+            # Continue with next file even on error
+            self.set_message(f"Upload failed ({filename}): {error}", "error")
+        self.current_queue_index += 1
+        self.process_upload_queue()
+
+    def upload_files_parallel(self, jobs, file_done):
+        """Upload (local_path, remote_path) jobs over up to FOLDER_UPLOAD_WORKERS sessions
+
+        The first worker uses the kept transfer session, the others open
+        their own and close them when the jobs run out. An extra session the
+        server refuses (e.g. 421, too many connections) just leaves its jobs
+        to the others. Many small files are bound by round trips, not
+        bandwidth, so they overlap well. Stops at the first transfer error or
+        cancel and raises it.
+        """
+        work = queue.Queue()
+        for job in jobs:
+            work.put(job)
+        lock = threading.Lock()
+        errors = []
+
+        def callback(sent):
+            if self.transfer_cancelled:
+                raise Exception("Cancelled by user")
+            self.add_progress(sent)
+
+        def worker(ftp):
+            opened = ftp is None
+            if opened:
+                if work.empty():
+                    return
+                try:
+                    ftp = TunedFTP()
+                    ftp.connect(self.host, self.port, timeout=30)
+                    ftp.login(DEFAULT_USER, DEFAULT_PASS)
+                except Exception:
+                    ftp.close()
+                    return
+            try:
+                while not (self.transfer_cancelled or errors):
+                    try:
+                        local_path, remote_path = work.get_nowait()
+                    except queue.Empty:
+                        break
+                    with open_for_upload(local_path) as f:
+                        ftp.storfile(f"STOR {remote_path}", f, callback=callback)
+                    with lock:
+                        file_done()
             except Exception as e:
-                self.transfer_active = False
-                if "Cancelled" in str(e):
-                    self.set_message("Upload cancelled", "info")
-                    self.transfer_queue = []  # Clear queue on cancel
-                else:
-                    self.set_message(f"Upload failed ({filename}): {e}", "error")
-                    # Continue with next file even on error
-                    self.current_queue_index += 1
-                    self.process_upload_queue()
+                errors.append(e)
+            finally:
+                if opened:
+                    try:
+                        ftp.quit() if not errors else ftp.close()
+                    except:
+                        pass
 
-        self.transfer_thread = threading.Thread(target=do_upload, daemon=True)
-        self.transfer_thread.start()
+        count = max(1, min(FOLDER_UPLOAD_WORKERS, len(jobs)))
+        threads = [threading.Thread(target=worker, args=(self.transfer_ftp if i == 0 else None,), daemon=True)
+                   for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.flush_progress()
+        if errors:
+            raise errors[0]
 
     def upload_folder_selected(self):
         """Upload entire folder recursively"""
@@ -406,101 +1035,91 @@ class FTPManager:
             self.set_message("Upload cancelled", "info")
             return
 
-        # Count files and total size
-        file_count = 0
+        # One walk gives the folders to create, the files and their total size
+        remote_dir = self.remote_dir
+        remote_root = f"{remote_dir.rstrip('/')}/{folder_name}"
+        remote_dirs = []
+        jobs = []
         total_size = 0
-        for item in folder_path.rglob('*'):
-            if item.is_file():
-                file_count += 1
-                total_size += item.stat().st_size
+        for root, dirs, files in os.walk(folder_path, followlinks=True):
+            dirs.sort(key=str.lower)
+            rel = os.path.relpath(root, folder_path)
+            remote_path = remote_root if rel == '.' else f"{remote_root}/{Path(rel).as_posix()}"
+            remote_dirs.append(remote_path)
+            for name in sorted(files, key=str.lower):
+                local_path = os.path.join(root, name)
+                try:
+                    st = os.stat(local_path)
+                except OSError:
+                    continue
+                # Skip FIFOs, sockets and devices: reading them blocks or fails
+                if not stat.S_ISREG(st.st_mode):
+                    continue
+                total_size += st.st_size
+                jobs.append((local_path, f"{remote_path}/{name}"))
+        file_count = len(jobs)
+        size_str = self.format_size(total_size).strip()
 
         self.transfer_active = True
-        self.transfer_filename = f"{folder_name}/ ({file_count} files)"
+        self.transfer_filename = f"{folder_name}/ ({file_count} files, {size_str})"
         self.transfer_action = "Uploading"
         self.transfer_progress = 0
         self.transfer_total = total_size
         self.transfer_cancelled = False
-        self.transfer_start_time = time.time()
-        self.transfer_last_time = time.time()
+        self.transfer_start_time = time.monotonic()
+        self.transfer_last_time = self.transfer_start_time
         self.transfer_last_progress = 0
         self.transfer_speed = 0
+        self._unreported = 0
 
         def do_folder_upload():
+            uploaded_count = [0]
+
+            def file_done():
+                uploaded_count[0] += 1
+                self.post(self.show_transfer_name, f"{folder_name}/ ({uploaded_count[0]}/{file_count})")
+
             try:
-                transfer_ftp = ftplib.FTP()
-                transfer_ftp.connect(self.host, self.port, timeout=30)
-                transfer_ftp.login(DEFAULT_USER, DEFAULT_PASS)
-
-                # Change to target directory
-                transfer_ftp.cwd(self.remote_dir)
-
-                uploaded_count = [0]
-
-                def upload_recursive(local_path, remote_base_path):
-                    """Upload folder recursively
-                    local_path: Path object of local folder
-                    remote_base_path: Current remote path relative to initial self.remote_dir
-                    """
-                    if self.transfer_cancelled:
-                        raise Exception("Cancelled by user")
-
-                    # Create the remote directory for this folder
-                    # Go to parent directory first
-                    parent_parts = remote_base_path.split('/')[:-1] if '/' in remote_base_path else []
-                    if parent_parts:
-                        parent_path = '/'.join(parent_parts)
-                        full_parent = f"{self.remote_dir}/{parent_path}".rstrip('/')
-                    else:
-                        full_parent = self.remote_dir
-
-                    transfer_ftp.cwd(full_parent)
-
-                    # Create and enter the directory
-                    dir_name = remote_base_path.split('/')[-1]
+                with self.transfer_lock:
                     try:
-                        transfer_ftp.mkd(dir_name)
-                    except ftplib.error_perm:
-                        pass  # Directory may already exist
-
-                    transfer_ftp.cwd(dir_name)
-
-                    # Upload files and recurse into subdirectories
-                    for item in sorted(local_path.iterdir(), key=lambda x: (x.is_file(), x.name.lower())):
-                        if self.transfer_cancelled:
-                            raise Exception("Cancelled by user")
-
-                        if item.is_file():
-                            # Upload with progress callback
-                            def callback(data):
-                                if self.transfer_cancelled:
-                                    raise Exception("Cancelled by user")
-                                self.transfer_progress += len(data)
-
-                            with open(item, 'rb') as f:
-                                transfer_ftp.storbinary(f"STOR {item.name}", f, blocksize=8192, callback=callback)
-                            uploaded_count[0] += 1
-                            self.transfer_filename = f"{folder_name}/ ({uploaded_count[0]}/{file_count})"
-                        elif item.is_dir():
-                            new_remote_path = f"{remote_base_path}/{item.name}"
-                            upload_recursive(item, new_remote_path)
-                            # Return to current directory after recursion
-                            transfer_ftp.cwd(f"{self.remote_dir}/{remote_base_path}".rstrip('/'))
-
-                upload_recursive(folder_path, folder_name)
-
-                transfer_ftp.quit()
-                self.refresh_remote()
-                self.set_message(f"Uploaded folder: {folder_name}/ ({uploaded_count[0]} files)", "success")
+                        transfer_ftp = self.get_transfer_ftp()
+
+                        # Create every folder first so the files can then be
+                        # uploaded in any order, by any worker
+                        for remote_path in remote_dirs:
+                            if self.transfer_cancelled:
+                                raise Exception("Cancelled by user")
+                            try:
+                                transfer_ftp.mkd(remote_path)
+                            except ftplib.error_perm:
+                                pass  # Directory may already exist
+
+                        self.upload_files_parallel(jobs, file_done)
+                    except Exception:
+                        self.close_transfer_ftp()
+                        raise
             except Exception as e:
-                if "Cancelled" in str(e):
-                    self.set_message("Upload cancelled", "info")
-                else:
-                    self.set_message(f"Upload failed: {e}", "error")
-            finally:
-                self.transfer_active = False
+                self.post(self.finish_folder_upload, remote_dir, folder_name, uploaded_count[0], size_str, e)
+            else:
+                self.post(self.finish_folder_upload, remote_dir, folder_name, uploaded_count[0], size_str, None)
 
-        self.transfer_thread = threading.Thread(target=do_folder_upload, daemon=True)
-        self.transfer_thread.start()
+        self.submit_transfer(do_folder_upload)
+
+    def show_transfer_name(self, name):
+        """Set the name the progress bar shows (UI thread)"""
+        self.transfer_filename = name
+
+    def finish_folder_upload(self, remote_dir, folder_name, count, size_str, error):
+        """Apply a finished folder upload (UI thread)"""
+        self.transfer_active = False
+        if error is None:
+            self.add_entry(True, remote_dir, {
+                'name': folder_name, 'size': 0, 'is_dir': True, 'size_str': DIR_SIZE_STR})
+            self.set_message(f"Uploaded folder: {folder_name}/ ({count} files, {size_str})", "success")
+        elif "Cancelled" in str(error):
+            self.set_message("Upload cancelled", "info")
+        else:
+            self.set_message(f"Upload failed: {error}", "error")
 
     def download_selected(self):
         if not self.connected:
@@ -554,12 +1173,11 @@ class FTPManager:
             self.process_download_queue()
 
     def process_download_queue(self):
-        """Process the download queue one file at a time"""
+        """Start the next file of the download queue (UI thread)"""
         if self.current_queue_index >= len(self.transfer_queue):
             # Queue finished
             self.set_message(f"Downloaded {len(self.transfer_queue)} file(s)", "success")
             self.transfer_queue = []
-            self.refresh_local()
             return
 
         item = self.transfer_queue[self.current_queue_index]
@@ -577,78 +1195,87 @@ class FTPManager:
         self.transfer_filename = f"{queue_info} {filename}"
         self.transfer_action = "Downloading"
         self.transfer_cancelled = False
-        self.transfer_start_time = time.time()
-        self.transfer_last_time = time.time()
+        self.transfer_start_time = time.monotonic()
+        self.transfer_last_time = self.transfer_start_time
         self.transfer_last_progress = 0
         self.transfer_speed = 0
+        self._unreported = 0
 
         def do_download():
-            try:
-                # Create a new FTP connection for the transfer
-                transfer_ftp = ftplib.FTP()
-                transfer_ftp.connect(self.host, self.port, timeout=30)
-                transfer_ftp.login(DEFAULT_USER, DEFAULT_PASS)
-                transfer_ftp.cwd(remote_dir)
-
-                with open(local_path, 'wb') as f:
-                    def callback(data):
-                        if self.transfer_cancelled:
-                            raise Exception("Cancelled by user")
-                        self.transfer_progress += len(data)
-                        f.write(data)
+            def callback(received):
+                if self.transfer_cancelled:
+                    raise Exception("Cancelled by user")
+                self.add_progress(received)
 
-                    transfer_ftp.retrbinary(f"RETR {filename}", callback, blocksize=8192)
-
-                transfer_ftp.quit()
-
-                # Move to next file in queue (will set transfer_active=False if done)
-                self.transfer_active = False  # Turn off before starting next
-                self.current_queue_index += 1
-                self.process_download_queue()
+            try:
+                with self.transfer_lock:
+                    try:
+                        transfer_ftp = self.get_transfer_ftp()
+                        self.transfer_cwd(remote_dir)
+                        with open_for_download(local_path) as f:
+                            transfer_ftp.retrfile(f"RETR {filename}", f, callback=callback)
+                    except Exception:
+                        self.close_transfer_ftp()
+                        raise
+                self.flush_progress()
             except Exception as e:
-                self.transfer_active = False
                 if "Cancelled" in str(e):
                     try:
                         local_path.unlink()
                     except:
                         pass
-                    self.set_message("Download cancelled", "info")
-                    self.transfer_queue = []  # Clear queue on cancel
-                else:
-                    self.set_message(f"Download failed ({filename}): {e}", "error")
-                    # Continue with next file even on error
-                    self.current_queue_index += 1
-                    self.process_download_queue()
+                self.post(self.finish_download, local_path, file_size, e)
+            else:
+                self.post(self.finish_download, local_path, file_size, None)
+
+        self.submit_transfer(do_download)
 
-        self.transfer_thread = threading.Thread(target=do_download, daemon=True)
-        self.transfer_thread.start()
+    def finish_download(self, local_path, file_size, error):
+        """Apply one finished queued download and start the next (UI thread)"""
+        self.transfer_active = False
+        filename = local_path.name
+        if error is None:
+            self.add_entry(False, local_path.parent, {
+                'name': filename, 'size': file_size, 'is_dir': False, 'path': local_path,
+                'size_str': self.format_size(file_size)})
+        elif "Cancelled" in str(error):
+            self.set_message("Download cancelled", "info")
+            self.transfer_queue = []  # Clear queue on cancel
+            return
+        else:
+            # Continue with next file even on error
+            self.set_message(f"Download failed ({filename}): {error}", "error")
+        self.current_queue_index += 1
+        self.process_download_queue()
+
+    def walk_remote(self, path):
+        """Collect all files and folders under a remote path, one listing per folder
+
+        Returns (files, dirs) as absolute paths. dirs starts with path itself
+        and lists every folder before its subfolders.
+        """
+        files = []
+        dirs = []
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            dirs.append(current)
+            for entry in self.list_remote(current):
+                full = f"{current.rstrip('/')}/{entry['name']}"
+                if entry['is_dir']:
+                    stack.append(full)
+                else:
+                    files.append(full)
+        return files, dirs
 
     def delete_remote_dir_recursive(self, dirname):
         """Recursively delete a remote directory"""
-        # Save current directory
-        original_dir = self.ftp.pwd()
-
-        try:
-            self.ftp.cwd(dirname)
-
-            # Get listing
-            items = []
-            self.ftp.retrlines('LIST', items.append)
-
-            for item in items:
-                parsed = self.parse_list_line(item)
-                if parsed:
-                    if parsed['is_dir']:
-                        self.delete_remote_dir_recursive(parsed['name'])
-                    else:
-                        self.ftp.delete(parsed['name'])
-
-            # Go back and remove the now-empty directory
-            self.ftp.cwd(original_dir)
-            self.ftp.rmd(dirname)
-        except Exception as e:
-            self.ftp.cwd(original_dir)
-            raise e
+        # Absolute paths throughout, so the working directory never changes
+        files, dirs = self.walk_remote(f"{self.remote_dir.rstrip('/')}/{dirname}")
+        for path in files:
+            self.ftp.delete(path)
+        for path in reversed(dirs):
+            self.ftp.rmd(path)
 
     def delete_selected(self):
         if self.mode == "remote" and self.connected:
@@ -774,6 +1401,7 @@ class FTPManager:
             curses.start_color()
             curses.curs_set(0)
             self.stdscr.keypad(True)
+            self.invalidate()
 
             after_mtime = os.path.getmtime(tmp_path)
             if after_mtime > before_mtime:
@@ -790,6 +1418,7 @@ class FTPManager:
 
     def get_input(self, prompt, prefill=""):
         h, w = self.stdscr.getmaxyx()
+        self.forget_rep_bar()  # The prompt goes on the progress row
         self.stdscr.addstr(h-1, 0, prompt + " " * (w - len(prompt) - 1), curses.color_pair(5))
 
         # If prefill provided, show it and allow editing
@@ -851,6 +1480,7 @@ class FTPManager:
 
         curses.noecho()
         curses.curs_set(0)
+        self.invalidate()
         return result
 
     def show_file_content(self, filename, lines):
@@ -887,6 +1517,8 @@ class FTPManager:
             elif key == curses.KEY_NPAGE:
                 scroll = min(len(lines) - visible_lines, scroll + visible_lines)
 
+        self.invalidate()
+
     def set_server(self):
         # Prefill with current IP for easy editing (just change last octet)
         new_host = self.get_input("Server IP: ", self.host)
@@ -902,11 +1534,179 @@ class FTPManager:
                 pass
         self.set_message(f"Server set to {self.host}:{self.port}", "info")
 
-    def draw(self):
-        self.stdscr.clear()
+    def maybe_draw(self, force=False):
+        """Redraw after input, or for progress at most every DRAW_INTERVAL"""
+        now = time.monotonic()
+        if force or (self._progress_dirty and now - self._last_draw >= DRAW_INTERVAL):
+            self._progress_dirty = False
+            sig = self.progress_signature(now)
+            if not force and sig == self._last_progress_sig:
+                return  # Nothing visible moved, e.g. less than 0.1% more bytes
+            self._last_progress_sig = sig
+            self._last_draw = now
+            self.draw(full=force)
+
+    def progress_signature(self, now):
+        """What background updates can change on screen, at the precision shown
+
+        The half-second bucket lets the speed (recomputed every 0.5s) and byte
+        counts move on big files where 0.1% takes a while.
+        """
+        return (int(now * 2), self.transfer_active, self.transfer_filename,
+                self.transfer_progress * 1000 // (self.transfer_total or 1),
+                self.message, self.message_type, self.get_current_list())
+
+    def frame_signature(self, h, w):
+        """Everything a frame shows depends on; equal signatures draw the same frame"""
+        return (h, w, self.cursor, self.scroll_offset, self.mode, self.connected,
+                self.host, self.port, self.remote_dir, self.local_dir,
+                self.get_current_list(), len(self.selected_files),
+                self.transfer_active, self.transfer_action, self.transfer_filename,
+                self.transfer_progress, self.transfer_total, self.transfer_speed,
+                self.message, self.message_type)
+
+    def invalidate(self):
+        """Forget the drawn rows, e.g. after a modal painted over them"""
+        self.forget_rep_bar()
+        self._rows.clear()
+        self._frame_sig = None
+        self.stdscr.erase()
+        self.stdscr.noutrefresh()
+
+    def restore_screen(self):
+        """Show the windows again over a modal drawn on stdscr, in one update
+
+        Their contents are still current, so nothing is redrawn; curses
+        only sends the cells the modal covered.
+        """
+        self.stdscr.erase()
+        self.stdscr.noutrefresh()
+        for top, win in self._windows:
+            win.touchwin()
+            win.noutrefresh()
+        curses.doupdate()
+
+    def make_windows(self, h, w):
+        """Split the screen into header, file list, help and message windows"""
+        self._windows = [
+            (0, curses.newwin(2, w, 0, 0)),
+            (2, curses.newwin(h - 4, w, 2, 0)),
+            (h - 2, curses.newwin(1, w, h - 2, 0)),
+            (h - 1, curses.newwin(1, w, h - 1, 0)),
+        ]
+        self._touched.clear()
+
+    def put_row(self, y, segments):
+        """Draw a screen row from (x, text, n, attr) segments unless it is unchanged"""
+        old = self._rows.get(y)
+        if old == segments:
+            return
+        self._rows[y] = segments
+        for top, win in reversed(self._windows):
+            if y >= top:
+                break
+        y -= top
+        try:
+            if old and len(old) == len(segments) == 1 and old[0][:3] == segments[0][:3]:
+                # Same text, new colour: recolour in place up to the line end
+                win.chgat(y, segments[0][0], -1, segments[0][3])
+            else:
+                win.move(y, 0)
+                win.clrtoeol()
+                for x, text, n, attr in segments:
+                    win.addnstr(y, x, text, n, attr)
+        except curses.error:
+            pass
+        self._touched.add(top)
+
+    def draw(self, full=True):
+        """Draw a frame; without full, only what background work can change
+
+        That is the message/progress row, plus the file list when a
+        transfer replaced it.
+        """
         h, w = self.stdscr.getmaxyx()
+        if h < 5:
+            return  # No room for header, list and status
+        if (h, w) != self._rows_size:
+            self._rows_size = (h, w)
+            self.invalidate()
+            self.make_windows(h, w)
+            full = True
+
+        # Keys that changed nothing, e.g. up on the first row, cost no frame
+        sig = self.frame_signature(h, w)
+        if sig == self._frame_sig:
+            return
+        self._frame_sig = sig
+
+        if full:
+            self.draw_header(w)
+            self.draw_help(h, w)
+        if full or self.get_current_list() is not self._drawn_list:
+            self.draw_list(h, w)
+        self.draw_message(h, w)
+        self.update_screen()
+
+    def update_screen(self):
+        """Copy only the windows that changed, then write the screen once"""
+        for top, win in self._windows:
+            if top in self._touched:
+                win.noutrefresh()
+        self._touched.clear()
+        curses.doupdate()
+        if self._rep_bar:
+            self.send_rep_bar(*self._rep_bar)
+            self._rep_bar = None
+
+    def send_rep_bar(self, y, x, filled, width):
+        """Write a progress bar with ECMA-48 REP (CSI n b) straight to the terminal
+
+        Each run is one cell plus "repeat it n-1 times" instead of n 3-byte
+        characters. curses holds blanks there, so the cursor is put back
+        where it expects it, and forget_rep_bar() makes it repaint the row.
+        """
+        out = curses.tparm(curses.tigetstr('cup'), y, x)
+        # Same look as the rest of the row (colour pair 1, bold); doupdate
+        # leaves the terminal in normal attributes and sgr0 restores them
+        for cap, args in (('bold', ()), ('setaf', (curses.COLOR_CYAN,))):
+            seq = curses.tigetstr(cap)
+            if seq:
+                out += curses.tparm(seq, *args)
+        for cell, count in (('█', filled), ('░', width - filled)):
+            if count:
+                out += cell.encode('utf-8')
+                if count > 1:
+                    out += b"\x1b[%db" % (count - 1)
+        out += curses.tigetstr('sgr0') or b""
+        cursor_y, cursor_x = curses.getsyx()
+        out += curses.tparm(curses.tigetstr('cup'), max(cursor_y, 0), max(cursor_x, 0))
+        os.write(sys.stdout.fileno(), out)
+        self._rep_row = y
+
+    def forget_rep_bar(self):
+        """Have curses rewrite the row holding a REP-drawn bar next time it is updated"""
+        if self._rep_row is not None:
+            # On the window that owns the row: touching stdscr there would
+            # make its next getch() paint stdscr's blank line over it
+            for top, win in reversed(self._windows):
+                if self._rep_row >= top:
+                    try:
+                        win.redrawln(self._rep_row - top, 1)
+                    except curses.error:
+                        pass
+                    break
+            self._rep_row = None
+
+    @staticmethod
+    def terminal_has_rep():
+        """True when terminfo lists the REP capability and cursor addressing"""
+        try:
+            return bool(curses.tigetstr('rep') and curses.tigetstr('cup'))
+        except curses.error:
+            return False
 
-        # Header
+    def draw_header(self, w):
         title = "═══ FTP File Manager ═══"
         if self.connected:
             status = f" ● {self.host}:{self.port} "
@@ -915,12 +1715,11 @@ class FTPManager:
             status = " ○ Disconnected "
             status_color = curses.color_pair(3) | curses.A_BOLD
 
-        try:
-            self.stdscr.addnstr(0, 0, " " * w, w-1, curses.color_pair(5))
-            self.stdscr.addstr(0, (w - len(title)) // 2, title, curses.color_pair(5) | curses.A_BOLD)
-            self.stdscr.addstr(0, min(w - len(status) - 1, w-len(status)), status[:w-1], status_color)
-        except curses.error:
-            pass
+        self.put_row(0, (
+            (0, " " * w, w-1, curses.color_pair(5)),
+            ((w - len(title)) // 2, title, len(title), curses.color_pair(5) | curses.A_BOLD),
+            (min(w - len(status) - 1, w-len(status)), status[:w-1], len(status[:w-1]), status_color),
+        ))
 
         # Path bar - different colors for remote vs local
         if self.mode == "remote":
@@ -931,15 +1730,14 @@ class FTPManager:
             path_color = curses.color_pair(9)  # Green for local
         mode_indicator = "[TAB to switch]"
 
-        try:
-            self.stdscr.addnstr(1, 0, " " * w, w-1, path_color)
-            self.stdscr.addnstr(1, 0, path_str, w - len(mode_indicator) - 2, path_color | curses.A_BOLD)
-            self.stdscr.addnstr(1, w - len(mode_indicator) - 1, mode_indicator, len(mode_indicator), curses.color_pair(4))
-        except curses.error:
-            pass
+        self.put_row(1, (
+            (0, " " * w, w-1, path_color),
+            (0, path_str, w - len(mode_indicator) - 2, path_color | curses.A_BOLD),
+            (w - len(mode_indicator) - 1, mode_indicator, len(mode_indicator), curses.color_pair(4)),
+        ))
 
-        # File list
-        items = self.get_current_list()
+    def draw_list(self, h, w):
+        items = self._drawn_list = self.get_current_list()
         list_height = h - 5  # Header, path, help, message, status
 
         # Adjust scroll
@@ -948,6 +1746,17 @@ class FTPManager:
         elif self.cursor >= self.scroll_offset + list_height:
             self.scroll_offset = self.cursor - list_height + 1
 
+        for i in range(list_height):
+            idx = i + self.scroll_offset
+            if idx < len(items):
+                self.draw_list_row(items, idx, w)
+            else:
+                self.put_row(i + 2, ())
+
+    def draw_list_row(self, items, idx, w):
+        """Draw entry idx of items on its screen row (the list must not need scrolling)"""
+        name = items.names[idx]
+
         # Choose colors based on mode
         if self.mode == "remote":
             selected_color = curses.color_pair(7)   # Magenta selection for remote
@@ -956,104 +1765,96 @@ class FTPManager:
             selected_color = curses.color_pair(10)  # Green selection for local
             dir_color = curses.color_pair(11)       # Green directories for local
 
-        for i in range(list_height):
-            idx = i + self.scroll_offset
-            y = i + 2
-
-            if idx < len(items):
-                item = items[idx]
-                is_cursor_here = (idx == self.cursor)
-
-                # Check if file is marked for selection
-                if item['name'] != '..':
-                    if self.mode == "remote":
-                        file_key = f"remote:{self.remote_dir}/{item['name']}"
-                    else:
-                        file_key = f"local:{item['path']}"
-                    is_marked = file_key in self.selected_files
-                else:
-                    is_marked = False
-
-                # Format line with checkmark if selected
-                mark = "✓ " if is_marked else "  "
-                if item['is_dir']:
-                    icon = "📁 "
-                    name = item['name'] + "/"
-                    size_str = "     <DIR>"
-                else:
-                    icon = "📄 "
-                    name = item['name']
-                    size_str = self.format_size(item['size'])
-
-                line = f"{mark}{icon}{name}"
-                padding = w - len(line) - len(size_str) - 2
-                if padding > 0:
-                    line += " " * padding + size_str + " "
-                else:
-                    line = line[:w-1]
-
-                if is_cursor_here:
-                    self.stdscr.addnstr(y, 0, line.ljust(w), w, selected_color | curses.A_BOLD)
-                elif item['is_dir']:
-                    self.stdscr.addnstr(y, 0, line, w, dir_color)
-                else:
-                    self.stdscr.addnstr(y, 0, line, w)
-
-        # Help bar - show relevant actions based on mode
-        help_y = h - 2
-        if self.connected:
+        # Check if file is marked for selection
+        if name != '..':
             if self.mode == "remote":
-                help_text = " ↑↓:Nav │ Space:Mark │ d:Down │ D:Del │ /:Search │ v:View │ e:Edit │ Tab:Local │ c:Disc │ q:Quit "
+                file_key = f"remote:{self.remote_dir}/{name}"
             else:
-                help_text = " ↑↓:Nav │ Space:Mark │ u:Upload │ D:Del │ /:Search │ Tab:Remote │ c:Disc │ q:Quit "
+                file_key = f"local:{items.paths[idx]}"
+            is_marked = file_key in self.selected_files
         else:
-            help_text = " c:Connect │ s:Set Server │ Tab:Switch View │ q:Quit "
-        try:
-            self.stdscr.addnstr(help_y, 0, help_text.center(w)[:w-1], w-1, curses.color_pair(4))
-        except curses.error:
-            pass
+            is_marked = False
+
+        # Checkmark if selected
+        line = ("✓ " if is_marked else "  ") + items.rows(w)[idx]
 
+        if idx == self.cursor:
+            attr = selected_color | curses.A_BOLD
+        elif items.is_dir[idx]:
+            attr = dir_color
+        else:
+            attr = curses.A_NORMAL
+
+        # Same padded text whatever the colour, so moving the cursor is only
+        # a colour change for put_row. w-1 characters: the wide icon takes
+        # the last column
+        self.put_row(idx - self.scroll_offset + 2, ((0, line.ljust(w), w-1, attr),))
+
+    def move_cursor(self, cursor):
+        """Move the cursor, repainting just its old and new rows when both are on screen
+
+        Returns False when that is not enough and a full draw is needed.
+        """
+        old, self.cursor = self.cursor, cursor
+        if self._rows_size != self.stdscr.getmaxyx() or self._drawn_list is not self.get_current_list():
+            return False
+        h, w = self._rows_size
+        top = self.scroll_offset
+        if not (top <= old < top + h - 5 and top <= cursor < top + h - 5):
+            return False
+        self.draw_list_row(self._drawn_list, old, w)
+        self.draw_list_row(self._drawn_list, cursor, w)
+        self.update_screen()
+        return True
+
+    def draw_help(self, h, w):
+        # Show relevant actions based on mode
+        key = (self.connected, self.mode if self.connected else None)
+        self.put_row(h - 2, ((0, help_row(key, w), w-1, curses.color_pair(4)),))
+
+    def draw_message(self, h, w):
         # Message bar / Progress bar
         msg_y = h - 1
-        try:
-            if self.transfer_active:
-                # Calculate speed
-                current_time = time.time()
-                if current_time - self.transfer_last_time >= 0.5:  # Update speed every 0.5s
-                    bytes_diff = self.transfer_progress - self.transfer_last_progress
-                    time_diff = current_time - self.transfer_last_time
-                    if time_diff > 0:
-                        self.transfer_speed = bytes_diff / time_diff
-                    self.transfer_last_progress = self.transfer_progress
-                    self.transfer_last_time = current_time
-
-                # Show progress bar
-                percent = self.transfer_progress / self.transfer_total if self.transfer_total > 0 else 0
-                bar_width = min(30, w - 70)
-                filled = int(bar_width * percent)
-                bar = '█' * filled + '░' * (bar_width - filled)
-
-                size_str = f"{self.format_size(self.transfer_progress).strip()}/{self.format_size(self.transfer_total).strip()}"
-                speed_str = f"{self.format_size(self.transfer_speed).strip()}/s"
-                max_name = 18
-                display_name = self.transfer_filename[:max_name-2] + '..' if len(self.transfer_filename) > max_name else self.transfer_filename
-
-                progress_text = f" {self.transfer_action}: {display_name}  [{bar}] {percent:>5.1%}  {size_str}  {speed_str}  (x to cancel)"
-                self.stdscr.addnstr(msg_y, 0, progress_text.ljust(w-1), w-1, curses.color_pair(1) | curses.A_BOLD)
-            elif self.message:
-                if self.message_type == "success":
-                    color = curses.color_pair(2)
-                elif self.message_type == "error":
-                    color = curses.color_pair(3)
-                else:
-                    color = curses.color_pair(1)
-                self.stdscr.addnstr(msg_y, 0, f" {self.message}".ljust(w-1), w-1, color)
+        if self.transfer_active:
+            # Read the counter once so the whole frame shows one value
+            progress = self.transfer_progress
+
+            # Show progress bar
+            percent = progress / self.transfer_total if self.transfer_total > 0 else 0
+            bar_width = max(0, min(BAR_WIDTH, w - 70))
+            filled = min(int(bar_width * percent), bar_width)
+            bar = BAR_CELLS[BAR_WIDTH - filled:BAR_WIDTH - filled + bar_width]
+
+            # Progress and speed change every frame; caching them would only
+            # push the listing sizes out of the cache
+            size_str = f"{format_size(progress).strip()}/{self.format_size(self.transfer_total).strip()}"
+            speed_str = f"{format_size(self.transfer_speed).strip()}/s"
+            max_name = 18
+            display_name = self.transfer_filename[:max_name-2] + '..' if len(self.transfer_filename) > max_name else self.transfer_filename
+
+            prefix = f" {self.transfer_action}: {display_name}  ["
+            # The bar column is only known for sure when everything before it is ASCII
+            if self.use_rep and bar_width and len(prefix.encode('utf-8')) == len(prefix):
+                self._rep_bar = (msg_y, len(prefix), filled, bar_width)
+                bar = " " * bar_width
             else:
-                self.stdscr.addnstr(msg_y, 0, " " * (w-1), w-1)
-        except curses.error:
-            pass
+                self.forget_rep_bar()
 
-        self.stdscr.refresh()
+            progress_text = f"{prefix}{bar}] {percent:>5.1%}  {size_str}  {speed_str}  (x to cancel)"
+            self.put_row(msg_y, ((0, progress_text.ljust(w-1), w-1, curses.color_pair(1) | curses.A_BOLD),))
+            return
+
+        self.forget_rep_bar()
+        if self.message:
+            if self.message_type == "success":
+                color = curses.color_pair(2)
+            elif self.message_type == "error":
+                color = curses.color_pair(3)
+            else:
+                color = curses.color_pair(1)
+            self.put_row(msg_y, ((0, f" {self.message}".ljust(w-1), w-1, color),))
+        else:
+            self.put_row(msg_y, ())
 
     def confirm(self, prompt, modal_type="default"):
         h, w = self.stdscr.getmaxyx()
@@ -1080,41 +1881,41 @@ class FTPManager:
 
         # Draw modal box
         try:
+            top_border, empty_line, bottom_border = modal_borders(modal_width, title)
+
             # Top border with title
-            top_border = "╔" + "═" * ((modal_width - len(title) - 4) // 2) + f" {title} " + "═" * ((modal_width - len(title) - 3) // 2) + "╗"
-            self.stdscr.addnstr(start_y, start_x, top_border[:modal_width], modal_width, border_color | curses.A_BOLD)
+            self.stdscr.addnstr(start_y, start_x, top_border, modal_width, border_color | curses.A_BOLD)
 
             # Empty line
-            self.stdscr.addnstr(start_y + 1, start_x, "║" + " " * (modal_width - 2) + "║", modal_width, border_color | curses.A_BOLD)
+            self.stdscr.addnstr(start_y + 1, start_x, empty_line, modal_width, border_color | curses.A_BOLD)
 
-            # Prompt line
+            # Prompt line: one write with the border colour, then recolour the inside
             prompt_text = prompt[:modal_width - 4].center(modal_width - 2)
-            self.stdscr.addnstr(start_y + 2, start_x, "║", 1, border_color | curses.A_BOLD)
-            self.stdscr.addnstr(start_y + 2, start_x + 1, prompt_text, modal_width - 2)
-            self.stdscr.addnstr(start_y + 2, start_x + modal_width - 1, "║", 1, border_color | curses.A_BOLD)
+            self.stdscr.addnstr(start_y + 2, start_x, "║" + prompt_text + "║", modal_width, border_color | curses.A_BOLD)
+            self.stdscr.chgat(start_y + 2, start_x + 1, modal_width - 2, curses.A_NORMAL)
 
             # Empty line
-            self.stdscr.addnstr(start_y + 3, start_x, "║" + " " * (modal_width - 2) + "║", modal_width, border_color | curses.A_BOLD)
+            self.stdscr.addnstr(start_y + 3, start_x, empty_line, modal_width, border_color | curses.A_BOLD)
 
             # Buttons line
             buttons = "  [Enter] Yes    [Esc] No  "
-            buttons_text = buttons.center(modal_width - 2)
-            self.stdscr.addnstr(start_y + 4, start_x, "║", 1, border_color | curses.A_BOLD)
-            self.stdscr.addnstr(start_y + 4, start_x + 1, buttons_text, modal_width - 2, curses.color_pair(2) | curses.A_BOLD)
-            self.stdscr.addnstr(start_y + 4, start_x + modal_width - 1, "║", 1, border_color | curses.A_BOLD)
+            buttons_text = buttons.center(modal_width - 2)[:modal_width - 2]
+            self.stdscr.addnstr(start_y + 4, start_x, "║" + buttons_text + "║", modal_width, border_color | curses.A_BOLD)
+            self.stdscr.chgat(start_y + 4, start_x + 1, modal_width - 2, curses.color_pair(2) | curses.A_BOLD)
 
             # Bottom border
-            self.stdscr.addnstr(start_y + 5, start_x, "╚" + "═" * (modal_width - 2) + "╝", modal_width, border_color | curses.A_BOLD)
+            self.stdscr.addnstr(start_y + 5, start_x, bottom_border, modal_width, border_color | curses.A_BOLD)
 
         except curses.error:
             pass
 
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh()
+        curses.doupdate()
         key = self.stdscr.getch()
         result = key in (curses.KEY_ENTER, 10, 13, ord('y'), ord('Y'))
 
-        # Redraw screen to clear modal
-        self.draw()
+        # Clear the modal by showing the windows under it again
+        self.restore_screen()
 
         return result
 
@@ -1124,14 +1925,7 @@ class FTPManager:
         if not query:
             return
 
-        query_lower = query.lower()
-        items = self.get_current_list()
-
-        # Find matches
-        matches = []
-        for idx, item in enumerate(items):
-            if item['name'] != '..' and query_lower in item['name'].lower():
-                matches.append(idx)
+        matches = self.get_current_list().find(query)
 
         if not matches:
             self.set_message(f"No results for '{query}'", "info")
@@ -1141,128 +1935,155 @@ class FTPManager:
         self.cursor = matches[0]
         self.set_message(f"Found {len(matches)} result(s) for '{query}'", "success")
 
-    def run(self):
-        self.refresh_local()
-
-        while True:
-            self.draw()
-
-            # Use timeout for non-blocking input during transfers
-            if self.transfer_active:
-                self.stdscr.timeout(100)  # 100ms timeout for responsive progress updates
-            else:
-                self.stdscr.timeout(-1)  # Blocking
-
-            key = self.stdscr.getch()
-
-            # Handle 'x' during transfer - cancel it
-            if key == ord('x') and self.transfer_active:
-                self.transfer_cancelled = True
-                self.set_message("Cancelling transfer...", "info")
-                continue
-
-            if key == -1:  # No input (timeout)
-                continue
-
-            items = self.get_current_list()
-            max_cursor = len(items) - 1 if items else 0
-
-            if key == ord('q') or key == ord('Q'):
-                if self.connected:
-                    self.disconnect()
-                break
-
-            elif key == curses.KEY_UP or key == ord('k'):
-                if self.cursor > 0:
-                    self.cursor -= 1
+    def build_keymap(self):
+        """Map each key code to the method it runs"""
+        bindings = (
+            ((ord('q'), ord('Q')), self.quit),
+            ((curses.KEY_UP, ord('k')), self.cursor_up),
+            ((curses.KEY_DOWN, ord('j')), self.cursor_down),
+            ((curses.KEY_PPAGE,), self.page_up),
+            ((curses.KEY_NPAGE,), self.page_down),
+            ((curses.KEY_HOME,), self.cursor_home),
+            ((curses.KEY_END,), self.cursor_end),
+            ((ord(' '),), self.toggle_selection),
+            ((curses.KEY_ENTER, 10, 13, curses.KEY_RIGHT, ord('l')), self.enter_directory),
+            ((curses.KEY_LEFT, ord('h'), curses.KEY_BACKSPACE, 127), self.go_parent),
+            ((ord('\t'),), self.switch_mode),
+            ((ord('c'), ord('C')), self.toggle_connection),
+            ((ord('s'), ord('S')), self.change_server),
+            ((ord('u'),), self.upload_selected),
+            ((ord('d'),), self.download_selected),
+            ((ord('D'),), self.confirm_delete),
+            ((ord('r'),), self.rename_selected),
+            ((ord('m'),), self.make_directory),
+            ((ord('v'),), self.view_file),
+            ((ord('e'),), self.edit_file),
+            ((ord('R'),), self.refresh_view),
+            ((ord('f'), ord('/')), self.search_files),
+        )
+        return {key: action for keys, action in bindings for key in keys}
+
+    def quit(self):
+        if self.connected:
+            self.disconnect()
+        self.running = False
 
-            elif key == curses.KEY_DOWN or key == ord('j'):
-                if self.cursor < max_cursor:
-                    self.cursor += 1
+    def cursor_up(self):
+        if self.cursor > 0:
+            return self.move_cursor(self.cursor - 1)
 
-            elif key == curses.KEY_PPAGE:  # Page Up
-                self.cursor = max(0, self.cursor - 10)
+    def cursor_down(self):
+        if self.cursor < self.last_index():
+            return self.move_cursor(self.cursor + 1)
 
-            elif key == curses.KEY_NPAGE:  # Page Down
-                self.cursor = min(max_cursor, self.cursor + 10)
+    def page_up(self):
+        self.cursor = max(0, self.cursor - 10)
 
-            elif key == curses.KEY_HOME:
-                self.cursor = 0
-                self.scroll_offset = 0
+    def page_down(self):
+        self.cursor = min(self.last_index(), self.cursor + 10)
 
-            elif key == curses.KEY_END:
-                self.cursor = max_cursor
+    def cursor_home(self):
+        self.cursor = 0
+        self.scroll_offset = 0
 
-            elif key == ord(' '):  # Spacebar - toggle selection
-                self.toggle_selection()
+    def cursor_end(self):
+        self.cursor = self.last_index()
 
-            elif key in (curses.KEY_ENTER, 10, 13, curses.KEY_RIGHT, ord('l')):
-                self.enter_directory()
+    def go_parent(self):
+        self.cursor = 0
+        self.enter_directory()
 
-            elif key in (curses.KEY_LEFT, ord('h'), curses.KEY_BACKSPACE, 127):
-                # Go to parent
-                self.cursor = 0
-                self.enter_directory()
+    def switch_mode(self):
+        self.mode = "local" if self.mode == "remote" else "remote"
+        self.cursor = 0
+        self.scroll_offset = 0
+        if self.mode == "remote":
+            self.refresh_remote()
+        else:
+            self.refresh_local()
 
-            elif key == ord('\t'):  # Tab - switch mode
-                self.mode = "local" if self.mode == "remote" else "remote"
-                self.cursor = 0
-                self.scroll_offset = 0
-                if self.mode == "remote":
-                    self.refresh_remote()
-                else:
-                    self.refresh_local()
+    def toggle_connection(self):
+        if not self.connected:
+            self.connect()
+        else:
+            self.disconnect()
 
-            elif key == ord('c') or key == ord('C'):
-                if not self.connected:
-                    self.connect()
-                else:
-                    self.disconnect()
+    def change_server(self):
+        if not self.connected:
+            self.set_server()
 
-            elif key == ord('s') or key == ord('S'):
-                if not self.connected:
-                    self.set_server()
+    def confirm_delete(self):
+        item = self.get_selected_item()
+        if item and item['name'] != '..':
+            if self.confirm(f"Delete '{item['name']}'?", "delete"):
+                self.delete_selected()
 
-            elif key == ord('u'):  # Upload
-                self.upload_selected()
+    def refresh_view(self):
+        if self.mode == "remote":
+            self.refresh_remote()
+        else:
+            self.refresh_local()
+        self.set_message("Refreshed", "info")
 
-            elif key == ord('d'):  # Download
-                self.download_selected()
+    def set_input_timeout(self, ms):
+        """getch() timeout in milliseconds (-1 blocks), set only when it changes"""
+        if ms != self._input_timeout:
+            self.stdscr.timeout(ms)
+            self._input_timeout = ms
 
-            elif key == ord('D'):  # Delete
-                item = self.get_selected_item()
-                if item and item['name'] != '..':
-                    if self.confirm(f"Delete '{item['name']}'?", "delete"):
-                        self.delete_selected()
+    def run(self):
+        self.refresh_local()
 
-            elif key == ord('r'):  # Rename
-                self.rename_selected()
+        redraw = True
+        while self.running:
+            self.pump()
+
+            # Timeouts only redraw when a transfer published new progress
+            self.maybe_draw(force=redraw)
+
+            # Poll for input while a transfer thread runs or its last update
+            # is not applied and drawn yet; block when idle so the loop does
+            # not spin. A job counts as busy until after its final post, so
+            # reading transfer_busy() first (and not just transfer_active)
+            # means a False result sees the queued event and dirty flag its
+            # last update left; reading them first could miss the end.
+            if self.transfer_busy() or self._progress_dirty or not self.ui_events.empty():
+                self.set_input_timeout(INPUT_POLL_MS)
+            else:
+                self.set_input_timeout(-1)
 
-            elif key == ord('m'):  # Make directory
-                self.make_directory()
+            key = self.stdscr.getch()
+            redraw = key != -1
 
-            elif key == ord('v'):  # View
-                self.view_file()
+            # Prompts and modals opened by this key must wait for their answer
+            if key != -1:
+                self.set_input_timeout(-1)
 
-            elif key == ord('e'):  # Edit
-                self.edit_file()
+            # Handle 'x' during transfer - cancel it
+            if key == ord('x') and self.transfer_active:
+                self.transfer_cancelled = True
+                self.set_message("Cancelling transfer...", "info")
+                continue
 
-            elif key == ord('R'):  # Refresh
-                if self.mode == "remote":
-                    self.refresh_remote()
-                else:
-                    self.refresh_local()
-                self.set_message("Refreshed", "info")
+            if key == -1:  # No input (timeout)
+                continue
 
-            elif key == ord('f') or key == ord('/'):  # Search
-                self.search_files()
+            action = self.keymap.get(key)
+            if action:
+                # Actions return True when they already painted their change
+                redraw = not action()
 
 def main(stdscr):
     manager = FTPManager(stdscr)
 
+    args = sys.argv[1:]
+    if '--rep' in args:
+        args.remove('--rep')
+        manager.use_rep = manager.terminal_has_rep()
+
     # Parse command line for quick connect
-    if len(sys.argv) > 1:
-        arg = sys.argv[1]
+    if args:
+        arg = args[0]
         if arg.startswith("ftp://"):
             arg = arg[6:].rstrip('/')
             if ':' in arg: